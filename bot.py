@@ -57,7 +57,9 @@ class TacBot(commands.Bot):
         intents.reactions = True
         intents.members = True
 
-        super().__init__(command_prefix="!", intents=intents, description="Havoc Tactical Bot")
+        # Votes arrive as component interactions that carry their own message,
+        # so nothing relies on the message cache
+        super().__init__(command_prefix="!", intents=intents, description="Havoc Tactical Bot", max_messages=None)
 
     async def setup_hook(self):
         """Called when the bot is starting up"""
@@ -1,16 +1,27 @@
+import asyncio
 import discord
+from collections import deque
 from discord.ext import commands, tasks
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import os
 import logging
+import re
 import time
-from typing import Dict, Any, Optional, Tuple
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from .google_forms_service import GoogleFormsService
-from .database import Database
+from .database import Database, run_db
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Separators and whitespace are stripped from submitted Discord IDs before validation
+_NON_DIGIT_RE = re.compile(r"\D")
+MIN_SNOWFLAKE = 4194304  # First possible Discord ID
+
+# Polls re-fetch responses created this long before the newest one seen, to allow for late-visible submissions
+RESPONSE_WATERMARK_MARGIN = timedelta(minutes=10)
+
 
 class ApplicationButtons(discord.ui.View):
     """Persistent view for application voting buttons."""
@@ -66,32 +77,39 @@ class ApplicationHandler(commands.Cog):
         # Thread lock for vote operations
         self._vote_lock = threading.Lock()
 
+        # Keeps response polls from overlapping (scheduled loop vs. !force_recheck)
+        self._poll_lock = asyncio.Lock()
+
         # Better rate limiting implementation
-        self._api_call_times = []
         self._max_calls_per_minute = 30  # More conservative limit
         self._rate_limit_window = 60  # 1-minute window
+        # Timestamps are appended in order, so stale ones are always at the head
+        self._api_call_times = deque(maxlen=self._max_calls_per_minute)
 
         # Add backoff when rate limited
-        self._last_rate_limit_time = 0
+        self._last_rate_limit_time = float("-inf")  # monotonic clock; 0 may be recent after boot
         self._rate_limit_backoff = 60  # Wait 1 minute when rate limited
 
         # Add request deduplication
         self._recent_responses = {}  # response_id -> timestamp
         self._response_cache_ttl = 300  # 5 minutes
 
+        # Polls only fetch responses submitted since this RFC3339 time; None fetches everything
+        self._responses_since = None
+
         # Load configuration
         self._load_config()
 
-        # Initialize database tables
-        self.db.initialize_applications_table()
-        self.db.initialize_votes_table()
-
         # Question mapping - will be built dynamically from form
         self.question_map = {}
 
         # Track processing states to prevent race conditions
         self._processing_applications = set()
 
+        # Message IDs of applications still open for voting, so votes on
+        # anything else are rejected without a database round-trip
+        self._app_message_ids: set[int] = set()
+
         # Start the polling task
         self.check_new_responses.start()
 
@@ -123,7 +141,7 @@ class ApplicationHandler(commands.Cog):
 
     def _is_rate_limited(self) -> bool:
         """Better rate limiting check with backoff"""
-        now = time.time()
+        now = time.monotonic()
 
         # Check if we're still in backoff period from previous rate limit
         if now - self._last_rate_limit_time < self._rate_limit_backoff:
@@ -131,7 +149,8 @@ class ApplicationHandler(commands.Cog):
 
         # Clean old timestamps
         cutoff = now - self._rate_limit_window
-        self._api_call_times = [t for t in self._api_call_times if t > cutoff]
+        while self._api_call_times and self._api_call_times[0] <= cutoff:
+            self._api_call_times.popleft()
 
         # Check if we're approaching limits
         is_limited = len(self._api_call_times) >= self._max_calls_per_minute
@@ -144,16 +163,25 @@ class ApplicationHandler(commands.Cog):
 
     def _record_api_call(self):
         """Record an API call timestamp"""
-        self._api_call_times.append(time.time())
+        self._api_call_times.append(time.monotonic())
+
+    @contextmanager
+    def _api_call_slot(self):
+        """Count the wrapped API call against the rate limit only if it succeeds"""
+        yield
+        self._record_api_call()
 
     def cog_unload(self):
         """Cleanup when cog is unloaded."""
         self.check_new_responses.cancel()
+        self.google_service.close()
+        self.db.close()
         logger.info("ApplicationHandler cog unloaded")
 
     async def cog_load(self):
         """Initialize when cog is loaded."""
         await self._cleanup_stale_data()
+        await self._restore_application_views()
         logger.info("ApplicationHandler cog loaded")
 
     async def _cleanup_stale_data(self):
@@ -161,19 +189,38 @@ class ApplicationHandler(commands.Cog):
         self._processing_applications.clear()
         # Reset rate limiting on startup
         self._api_call_times.clear()
-        self._last_rate_limit_time = 0
+        self._last_rate_limit_time = float("-inf")
         logger.info("Cleaned up stale application data")
 
+    async def _restore_application_views(self):
+        """Re-attach voting buttons to open applications so votes keep working after a restart."""
+        pending = await run_db(self.db.get_pending_applications)
+
+        for response_id, message_id in pending:
+            self.bot.add_view(ApplicationButtons(self, response_id), message_id=message_id)
+            self._app_message_ids.add(message_id)
+
+        logger.info(f"Restored voting buttons for {len(pending)} open application(s)")
+
     @tasks.loop(seconds=30)  # Default 30 seconds, configurable
     async def check_new_responses(self):
         """Check for new Google Form responses."""
+        # Skip rather than queue behind a poll that is already running
+        if self._poll_lock.locked():
+            return
+
+        async with self._poll_lock:
+            await self._poll_responses()
+
+    async def _poll_responses(self):
+        """Fetch form responses and process any not seen before. Caller must hold _poll_lock."""
         try:
             # Check rate limiting with better logging
             if self._is_rate_limited():
                 # Don't log this every time - only occasionally
                 if len(self._api_call_times) % 10 == 0 or not hasattr(self, "_last_rate_limit_log"):
                     logger.info("Rate limit active, skipping check (this message appears occasionally)")
-                    self._last_rate_limit_log = time.time()
+                    self._last_rate_limit_log = time.monotonic()
                 return
 
             # Build question map if not already done
@@ -183,28 +230,45 @@ class ApplicationHandler(commands.Cog):
                 if not self.question_map:
                     return
 
-            # Record API call BEFORE making it
-            self._record_api_call()
-
-            try:
-                responses = await self.google_service.get_form_responses(self.form_id)
-            except Exception as e:
-                # Don't record API call if it failed
-                if self._api_call_times:
-                    self._api_call_times.pop()
-                raise e
+            with self._api_call_slot():
+                responses = await self.google_service.get_form_responses(self.form_id, self._responses_since)
 
+            # Check which responses we haven't processed yet
+            new_responses = []
             for response in responses:
-                response_id = response["responseId"]
+                if not await run_db(self.db.is_response_processed, response["responseId"]):
+                    new_responses.append(response)
 
-                # Check if we've already processed this response
-                if not self.db.is_response_processed(response_id):
-                    await self._process_new_response(response)
-                    self.db.mark_response_processed(response_id)
+            if not new_responses:
+                self._advance_responses_since(responses)
+                return
+
+            # Resolve all applicants up front instead of one fetch_member per response
+            await self._prefetch_members(new_responses)
+
+            # Each posted response is marked processed in the same transaction that stores its message.
+            # Responses that were not recorded (usually because posting failed) are marked together at the end.
+            unrecorded = []
+            try:
+                for response in new_responses:
+                    if not await self._process_new_response(response):
+                        unrecorded.append(response["responseId"])
+            finally:
+                await run_db(self.db.batch_mark_responses_processed, unrecorded)
+
+            self._advance_responses_since(responses)
 
         except Exception as e:
             logger.error(f"Error checking for new responses: {e}")
 
+    def _advance_responses_since(self, responses: List[Dict[str, Any]]):
+        """Move the poll window up to the newest response once a poll has handled every response it fetched."""
+        created = [datetime.fromisoformat(r["createTime"].replace("Z", "+00:00")) for r in responses if r.get("createTime")]
+        if not created:
+            return
+        since = (max(created) - RESPONSE_WATERMARK_MARGIN).astimezone(timezone.utc)
+        self._responses_since = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
     @check_new_responses.before_loop
     async def before_check_responses(self):
         """Wait until bot is ready before starting the loop."""
@@ -220,38 +284,58 @@ class ApplicationHandler(commands.Cog):
                 logger.debug("Rate limit reached, cannot build question map")
                 return
 
-            # Record API call BEFORE making it
-            self._record_api_call()
-
-            try:
+            with self._api_call_slot():
                 form_info = await self.google_service.get_form_info(self.form_id)
-                self.question_map = self.google_service.build_question_map(form_info)
-                logger.info(f"Built question map with {len(self.question_map)} questions")
-            except Exception as e:
-                # Remove the recorded API call if it failed
-                if self._api_call_times:
-                    self._api_call_times.pop()
-                raise e
+
+            self.question_map = self.google_service.build_question_map(form_info)
+            logger.info(f"Built question map with {len(self.question_map)} questions")
 
         except Exception as e:
             logger.error(f"Error building question map: {e}")
             # Fallback to basic mapping if form info fails
             self.question_map = {}
 
-    async def _process_new_response(self, response: Dict[str, Any]):
-        """Process a new form response."""
+    async def _prefetch_members(self, responses: List[Dict[str, Any]]):
+        """Load applicants missing from the member cache using batched gateway queries."""
+        guild = self.bot.get_guild(self.guild_id)
+        if not guild:
+            return
+
+        member_ids = set()
+        for response in responses:
+            discord_data = self._extract_discord_id(response.get("answers", {}))
+            if not discord_data:
+                continue
+            try:
+                member_ids.add(int(discord_data[0]))
+            except ValueError:
+                continue
+
+        missing = [member_id for member_id in member_ids if guild.get_member(member_id) is None]
+
+        # query_members caches what it finds, so later get_member calls hit
+        for start in range(0, len(missing), 100):
+            end = start + 100
+            chunk = missing[start:end]
+            try:
+                await guild.query_members(user_ids=chunk, limit=len(chunk), cache=True)
+            except Exception as e:
+                logger.warning(f"Could not prefetch {len(chunk)} applicant(s): {e}")
+
+    async def _process_new_response(self, response: Dict[str, Any]) -> bool:
+        """Process a new form response. Returns True once the posted application is stored and marked processed."""
         response_id = response["responseId"]
 
         try:
             guild = self.bot.get_guild(self.guild_id)
             if not guild:
                 logger.error(f"Could not find guild with ID {self.guild_id}")
-                return
+                return False
 
             channel = guild.get_channel(self.channel_id)
             if not channel:
                 logger.error(f"Could not find channel with ID {self.channel_id}")
-                return
+                return False
 
             embed = await self._create_application_embed(response, guild)
 
@@ -259,16 +343,20 @@ class ApplicationHandler(commands.Cog):
             view = ApplicationButtons(self, response_id)
             message = await channel.send(embed=embed, view=view)
 
-            # Store message info in database
-            self.db.store_application_message(response_id, message.id, channel.id)
+            # Store message info and mark the response processed together, so it is never posted twice
+            if not await run_db(self.db.store_posted_application, response_id, message.id, channel.id):
+                return False
+            self._app_message_ids.add(message.id)
 
             # Send confirmation message to applicant
             await self._send_application_confirmation(response, guild)
 
             logger.info(f"Processed new application: {response_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Error processing response {response_id}: {e}")
+            return False
 
     async def _send_application_confirmation(self, response: Dict[str, Any], guild: discord.Guild):
         """Send confirmation message to applicant via DM, with channel fallback."""
@@ -313,7 +401,7 @@ class ApplicationHandler(commands.Cog):
     def _extract_discord_id(self, answers: Dict[str, Any]) -> Optional[Tuple[str, str]]:
         """Extract Discord ID from form answers."""
         try:
-            logger.debug(f"Available question IDs: {list(answers.keys())}")
+            logger.debug("Available question IDs: %s", list(answers))
 
             # Try configured question ID first
             possible_ids = [
@@ -329,7 +417,7 @@ class ApplicationHandler(commands.Cog):
                     if "textAnswers" in answer_data and answer_data["textAnswers"]["answers"]:
                         discord_id = answer_data["textAnswers"]["answers"][0]["value"].strip()
                         if self._validate_discord_id(discord_id):
-                            logger.debug(f"Found Discord ID using question_id: {question_id}")
+                            logger.debug("Found Discord ID using question_id: %s", question_id)
                             return discord_id, question_id
 
             # If direct lookup fails, search through all answers
@@ -338,7 +426,7 @@ class ApplicationHandler(commands.Cog):
                 if "textAnswers" in answer_data and answer_data["textAnswers"]["answers"]:
                     value = answer_data["textAnswers"]["answers"][0]["value"].strip()
                     if self._validate_discord_id(value):
-                        logger.debug(f"Found Discord ID pattern in question_id: {question_id}")
+                        logger.debug("Found Discord ID pattern in question_id: %s", question_id)
                         return value, question_id
 
             logger.warning("No Discord ID found in any answer")
@@ -355,36 +443,31 @@ class ApplicationHandler(commands.Cog):
 
         # Remove any whitespace and non-digit characters except for the ID
         # itself
-        cleaned_id = "".join(c for c in discord_id if c.isdigit())
+        cleaned_id = _NON_DIGIT_RE.sub("", discord_id)
 
         # Discord IDs are exactly 17-20 digits (snowflakes)
         if not (17 <= len(cleaned_id) <= 20):
             return False
 
         # Check if it's a reasonable snowflake (after Discord's epoch)
-        try:
-            snowflake = int(cleaned_id)
-            # Discord epoch: 2015-01-01, minimum reasonable ID
-            return snowflake > 4194304  # First possible Discord ID
-        except (ValueError, OverflowError):
-            return False
+        return int(cleaned_id) > MIN_SNOWFLAKE
 
     async def _get_discord_member(self, discord_id: str, guild: discord.Guild) -> Optional[discord.Member]:
         """Get Discord member by ID from the specified guild."""
         try:
             discord_id_int = int(discord_id)
-            logger.debug(f"Looking for Discord ID: {discord_id_int} in guild: {guild.name}")
+            logger.debug("Looking for Discord ID: %s in guild: %s", discord_id_int, guild.name)
 
             # Try get_member first (cached members only)
             member = guild.get_member(discord_id_int)
             if member:
-                logger.debug(f"Found member via get_member: {member.display_name}")
+                logger.debug("Found member via get_member: %s", member.display_name)
                 return member
 
             # If not in cache, try fetching from Discord API
             try:
                 member = await guild.fetch_member(discord_id_int)
-                logger.debug(f"Found member via fetch_member: {member.display_name}")
+                logger.debug("Found member via fetch_member: %s", member.display_name)
                 return member
             except discord.NotFound:
                 logger.warning(f"Member {discord_id_int} not found in guild {guild.name}")
@@ -437,28 +520,31 @@ class ApplicationHandler(commands.Cog):
             embed.set_thumbnail(url=thumbnail_url)
 
         # Add form answers as fields (sanitize input)
+        sanitize = self._sanitize_text
+        answers_get = answers.get
         for question_id, question_title in self.question_map.items():
             # Skip the Discord ID since we display it in the title/description
             if question_id == discord_question_id:
                 continue
 
-            if question_id in answers:
-                answer_data = answers[question_id]
+            answer_data = answers_get(question_id)
+            if answer_data is None:
+                continue
 
-                # Handle different answer types and sanitize
-                if "textAnswers" in answer_data:
-                    raw_answers = [a["value"] for a in answer_data["textAnswers"]["answers"]]
-                    answer_text = ", ".join(self._sanitize_text(ans) for ans in raw_answers)
-                else:
-                    answer_text = self._sanitize_text(str(answer_data))
+            # Handle different answer types and sanitize
+            text_answers = answer_data.get("textAnswers")
+            if text_answers is not None:
+                answer_text = ", ".join([sanitize(a["value"]) for a in text_answers["answers"]])
+            else:
+                answer_text = sanitize(str(answer_data))
 
-                # Let Discord handle embed length limits naturally
+            # Let Discord handle embed length limits naturally
 
-                embed.add_field(
-                    name=self._sanitize_text(question_title),
-                    value=answer_text or "*No answer provided*",
-                    inline=False,
-                )
+            embed.add_field(
+                name=sanitize(question_title),
+                value=answer_text or "*No answer provided*",
+                inline=False,
+            )
 
         # Add initial vote status
         embed.add_field(name="Votes", value="**Approvals (0):** None\n**Denials (0):** None", inline=False)
@@ -491,30 +577,20 @@ class ApplicationHandler(commands.Cog):
             await interaction.response.send_message("This application is currently being processed. Please wait.", ephemeral=True)
             return
 
+        # Only open applications accept votes
+        if interaction.message.id not in self._app_message_ids:
+            await interaction.response.send_message("This application is no longer open for voting.", ephemeral=True)
+            return
+
         try:
-            with self._vote_lock:
-                # Get current vote status
-                current_vote = self.db.get_user_vote(response_id, user_id)
-
-                if current_vote == vote_type:
-                    # Same vote - remove it (toggle off)
-                    self.db.remove_vote(response_id, user_id)
-                    await interaction.response.defer()
-                elif current_vote:
-                    # Different vote - update it
-                    self.db.update_vote(response_id, user_id, vote_type)
-                    await interaction.response.defer()
-                else:
-                    # New vote
-                    self.db.add_vote(response_id, user_id, vote_type)
-                    await interaction.response.defer()
+            # Record the vote off the event loop
+            vote_counts = await run_db(self._apply_vote, response_id, user_id, vote_type)
+            await interaction.response.defer()
 
             # Update embed with new vote counts
             await self._update_application_embed(interaction.message, response_id)
 
             # Check if this vote is decisive
-            vote_counts = self.db.get_vote_counts(response_id)
-
             if self._is_decisive_vote(vote_counts, vote_type):
                 await self._handle_decisive_vote(interaction, response_id, vote_type, vote_counts)
             else:
@@ -526,6 +602,30 @@ class ApplicationHandler(commands.Cog):
             if not interaction.response.is_done():
                 await interaction.response.send_message("An error occurred while processing your vote.", ephemeral=True)
 
+    def _apply_vote(self, response_id: str, user_id: int, vote_type: str) -> Dict[str, int]:
+        """Toggle, change or add a user's vote and return the new vote counts. Blocking; run via run_db."""
+        with self._vote_lock, self.db.transaction():
+            state = self.db.get_vote_state(response_id, user_id)
+            current_vote = state.pop("my_vote")
+
+            if current_vote is not None:
+                state[current_vote] -= 1
+
+            if current_vote == vote_type:
+                # Same vote - remove it (toggle off)
+                self.db.remove_vote(response_id, user_id)
+            else:
+                # New or changed vote
+                self.db.set_vote(response_id, user_id, vote_type)
+                state[vote_type] += 1
+
+        return state
+
+    def _remove_vote(self, response_id: str, user_id: int):
+        """Remove a user's vote. Blocking; run via run_db."""
+        with self._vote_lock:
+            self.db.remove_vote(response_id, user_id)
+
     def _is_decisive_vote(self, vote_counts: Dict[str, int], vote_type: str) -> bool:
         """Check if this vote reaches the threshold and is the deciding vote."""
         approvals = vote_counts.get("approve", 0)
@@ -573,13 +673,12 @@ class ApplicationHandler(commands.Cog):
 
             if view.cancelled:
                 # User cancelled - remove their vote
-                with self._vote_lock:
-                    self.db.remove_vote(response_id, interaction.user.id)
+                await run_db(self._remove_vote, response_id, interaction.user.id)
 
                 await self._update_application_embed(interaction.message, response_id)
 
                 # Recheck thresholds after cancellation
-                new_counts = self.db.get_vote_counts(response_id)
+                new_counts = await run_db(self.db.get_vote_counts, response_id)
                 await self._check_auto_process(interaction.message, response_id, new_counts)
 
             else:
@@ -603,17 +702,21 @@ class ApplicationHandler(commands.Cog):
         """Update application embed with current vote counts."""
         try:
             # Get vote data from database
-            votes = self.db.get_votes(response_id)
-            vote_counts = self.db.get_vote_counts(response_id)
+            votes = await run_db(self.db.get_votes, response_id)
 
             embed = message.embeds[0]
 
-            # Build vote display
-            approvers = [f"<@{vote['user_id']}>" for vote in votes if vote["vote_type"] == "approve"]
-            deniers = [f"<@{vote['user_id']}>" for vote in votes if vote["vote_type"] == "deny"]
+            # Build vote display in a single pass over the votes
+            voters = {"approve": [], "deny": []}
+            for user_id, vote_type in votes:
+                bucket = voters.get(vote_type)
+                if bucket is not None:
+                    bucket.append(f"<@{user_id}>")
+            approvers = voters["approve"]
+            deniers = voters["deny"]
 
-            approvals_count = vote_counts.get("approve", 0)
-            denials_count = vote_counts.get("deny", 0)
+            approvals_count = len(approvers)
+            denials_count = len(deniers)
 
             vote_info = f"**Approvals ({approvals_count}):** {', '.join(approvers) if approvers else 'None'}\n"
             vote_info += f"**Denials ({denials_count}):** {', '.join(deniers) if deniers else 'None'}"
@@ -637,11 +740,14 @@ class ApplicationHandler(commands.Cog):
         if response_id in self._processing_applications:
             return  # Already being processed
 
+        if message.id not in self._app_message_ids:
+            return  # Already decided
+
         self._processing_applications.add(response_id)
 
         try:
             # Check if already processed
-            app_data = self.db.get_application_by_message_id(message.id)
+            app_data = await run_db(self.db.get_application_by_message_id, message.id)
             if app_data and app_data.get("status") in ["accepted", "denied"]:
                 return
 
@@ -668,7 +774,9 @@ class ApplicationHandler(commands.Cog):
             await message.edit(embed=embed, view=None)
 
             # Mark as processed in database
-            self.db.set_application_status(response_id, decision)
+            if not await run_db(self.db.set_application_status, response_id, decision):
+                logger.warning(f"No stored application row for {response_id} when recording decision")
+            self._app_message_ids.discard(message.id)
 
             logger.info(f"Application {response_id} {decision}ed")
 
@@ -716,16 +824,8 @@ class ApplicationHandler(commands.Cog):
                 logger.warning("Rate limit reached, cannot fetch form responses")
                 return None, None
 
-            # Record API call BEFORE making it
-            self._record_api_call()
-
-            try:
+            with self._api_call_slot():
                 responses = await self.google_service.get_form_responses(self.form_id)
-            except Exception as e:
-                # Remove the recorded API call if it failed
-                if self._api_call_times:
-                    self._api_call_times.pop()
-                raise e
 
             target_response = next((r for r in responses if r["responseId"] == response_id), None)
 
@@ -783,25 +883,21 @@ class ApplicationHandler(commands.Cog):
                 except discord.HTTPException as e:
                     logger.error(f"Failed to send welcome message: {e}")
 
-    @commands.command(name="app_stats")
+    @commands.command(name="force_recheck")
     @commands.has_permissions(administrator=True)
-    async def application_stats(self, ctx):
-        """Show application statistics (admin only)."""
-        try:
-            stats = self.db.get_application_stats()
-
-            embed = discord.Embed(title="Application Statistics", color=discord.Color.blue())
-
-            embed.add_field(name="Total Applications", value=stats.get("total", 0), inline=True)
-            embed.add_field(name="Accepted", value=stats.get("accepted", 0), inline=True)
-            embed.add_field(name="Denied", value=stats.get("denied", 0), inline=True)
-            embed.add_field(name="Pending", value=stats.get("pending", 0), inline=True)
+    async def force_recheck(self, ctx):
+        """Poll the application form immediately (admin only)."""
+        if self._poll_lock.locked():
+            await ctx.send("Already checking for new applications.")
+            return
 
-            await ctx.send(embed=embed)
+        async with self._poll_lock:
+            # A forced recheck scans the whole form, not just the recent window
+            self._responses_since = None
+            await self._poll_responses()
 
-        except Exception as e:
-            logger.error(f"Error getting application stats: {e}")
-            await ctx.send("Error retrieving application statistics.")
+        await ctx.send("Checked for new applications.")
+        logger.info("Application recheck forced by admin command")
 
     @commands.command(name="reset_rate_limit")
     @commands.has_permissions(administrator=True)
@@ -809,7 +905,7 @@ class ApplicationHandler(commands.Cog):
         """Reset rate limiting counters (admin only)."""
         try:
             self._api_call_times.clear()
-            self._last_rate_limit_time = 0
+            self._last_rate_limit_time = float("-inf")
             await ctx.send("Rate limiting counters have been reset.")
             logger.info("Rate limiting counters reset by admin command")
         except Exception as e:
@@ -821,7 +917,7 @@ class ApplicationHandler(commands.Cog):
     async def rate_limit_status(self, ctx):
         """Show current rate limiting status (admin only)."""
         try:
-            now = time.time()
+            now = time.monotonic()
             cutoff = now - self._rate_limit_window
             recent_calls = [t for t in self._api_call_times if t > cutoff]
 
@@ -4,7 +4,8 @@ from discord import app_commands
 import os
 import logging
 from urllib.parse import urlencode
-import pytz
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from .database import run_db
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +33,10 @@ class ChatCommands(commands.Cog):
 
         timezone_str = os.getenv("TIMEZONE", "US/Eastern")
         try:
-            self.timezone = pytz.timezone(timezone_str)
-        except pytz.UnknownTimeZoneError:
+            self.timezone = ZoneInfo(timezone_str)
+        except (ZoneInfoNotFoundError, ValueError):
             logger.warning(f"Unknown timezone {timezone_str}, defaulting to US/Eastern")
-            self.timezone = pytz.timezone("US/Eastern")
+            self.timezone = ZoneInfo("US/Eastern")
 
         self.create_day = int(os.getenv("EVENT_CREATE_DAY", "0"))  # Monday
         self.create_hour = int(os.getenv("EVENT_CREATE_HOUR", "20"))  # 8 PM
@@ -170,7 +171,7 @@ class ChatCommands(commands.Cog):
                 return
 
             db = event_handler.db
-            stats = db.get_event_stats()
+            stats = await run_db(db.get_event_stats)
 
             embed = discord.Embed(title="Event Statistics", color=discord.Color.blue())
 
@@ -209,7 +210,7 @@ class ChatCommands(commands.Cog):
                 return
 
             db = app_handler.db
-            stats = db.get_application_stats()
+            stats = await run_db(db.get_application_stats)
 
             embed = discord.Embed(title="Application Statistics", color=discord.Color.blue())
 
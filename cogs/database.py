@@ -1,29 +1,290 @@
-import sqlite3
+import asyncio
 import os
 import logging
-from typing import Optional, Dict, Any
+import queue
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Tuple
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+
+try:
+    # Optional: bundles a newer SQLite than the interpreter's build (pip install .[sqlite])
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
 
 logger = logging.getLogger(__name__)
 
 
+class ApplicationStatus(IntEnum):
+    """Value stored in applications.status"""
+
+    PENDING = 0
+    ACCEPTED = 1
+    DENIED = 2
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+    @classmethod
+    def parse(cls, value) -> "ApplicationStatus":
+        """Accept an ApplicationStatus, its integer value, or a name such as 'accept' or 'denied'"""
+        if isinstance(value, str):
+            try:
+                return _STATUS_NAMES[value.lower()]
+            except KeyError:
+                raise ValueError(f"Unknown application status: {value!r}") from None
+        return cls(value)
+
+
+_STATUS_NAMES = {
+    "pending": ApplicationStatus.PENDING,
+    "accept": ApplicationStatus.ACCEPTED,
+    "accepted": ApplicationStatus.ACCEPTED,
+    "deny": ApplicationStatus.DENIED,
+    "denied": ApplicationStatus.DENIED,
+}
+
+APPLICATIONS_SCHEMA = """
+    response_id TEXT PRIMARY KEY,
+    message_id INTEGER,
+    channel_id INTEGER,
+    status INTEGER NOT NULL DEFAULT 0 CHECK (status IN (0, 1, 2)),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+"""
+
+# Per-connection settings applied every time a connection is opened.
+# journal_mode=WAL is persistent in the database file and is set once at init.
+CONNECTION_PRAGMAS = (
+    "synchronous=NORMAL",  # Safe under WAL; avoids an fsync per commit
+    "temp_store=MEMORY",
+    "cache_size=-32000",  # ~32 MB page cache
+    "wal_autocheckpoint=2000",  # Checkpoint the WAL every ~8 MB of commits rather than every 4 MB
+    "mmap_size=268435456",  # Serve reads of the first 256 MB from a memory map instead of read() calls
+    "busy_timeout=5000",  # Wait on a locked database instead of failing immediately
+    "foreign_keys=ON",
+)
+
+# Read-only connections kept open for SELECTs (opened lazily); writes share one connection
+READER_POOL_SIZE = min(10, os.cpu_count() or 4)
+
+# UPDATE/INSERT ... RETURNING needs SQLite 3.35+
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Stored in PRAGMA user_version; bump whenever _create_schema changes so existing databases pick it up
+SCHEMA_VERSION = 1
+
+# Rows deleted per transaction by cleanup_old_data, so the write lock is released between chunks
+CLEANUP_CHUNK_SIZE = 10000
+
+# Statements on the hot path live at module level so every call passes the
+# same SQL text and is served from the connection's statement cache.
+SQL_IS_PROCESSED = "SELECT EXISTS(SELECT 1 FROM processed_responses WHERE response_id = ?)"
+SQL_RECENT_PROCESSED = "SELECT response_id FROM processed_responses ORDER BY processed_at DESC LIMIT ?"
+SQL_MARK_PROCESSED = "INSERT OR IGNORE INTO processed_responses (response_id) VALUES (?)"
+SQL_STORE_APPLICATION = (
+    "INSERT OR REPLACE INTO applications (response_id, message_id, channel_id, status, updated_at) "
+    "VALUES (?, ?, ?, 0, CURRENT_TIMESTAMP)"
+)
+# Columns callers read from an application; the timestamps are never needed
+APPLICATION_COLUMNS = "response_id, message_id, channel_id, status"
+SQL_GET_APP_BY_MSG = f"SELECT {APPLICATION_COLUMNS} FROM applications WHERE message_id = ?"
+SQL_GET_APP_BY_RESPONSE = f"SELECT {APPLICATION_COLUMNS} FROM applications WHERE response_id = ?"
+SQL_GET_PENDING_APPS = "SELECT response_id, message_id FROM applications WHERE status = ? AND message_id IS NOT NULL"
+SQL_SET_APP_STATUS = "UPDATE applications SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE response_id = ?"
+SQL_ADD_VOTE = "INSERT INTO votes (response_id, user_id, vote_type) VALUES (?, ?, ?)"
+SQL_SET_VOTE = (
+    "INSERT INTO votes (response_id, user_id, vote_type) VALUES (?, ?, ?) "
+    "ON CONFLICT(response_id, user_id) DO UPDATE SET vote_type = excluded.vote_type, created_at = CURRENT_TIMESTAMP"
+)
+SQL_UPDATE_VOTE = "UPDATE votes SET vote_type = ?, created_at = CURRENT_TIMESTAMP WHERE response_id = ? AND user_id = ?"
+SQL_REMOVE_VOTE = "DELETE FROM votes WHERE response_id = ? AND user_id = ?"
+SQL_GET_USER_VOTE = "SELECT vote_type FROM votes WHERE response_id = ? AND user_id = ?"
+SQL_GET_VOTES = "SELECT user_id, vote_type FROM votes WHERE response_id = ? ORDER BY created_at DESC"
+SQL_GET_VOTE_COUNTS = "SELECT vote_type, COUNT(*) FROM votes WHERE response_id = ? GROUP BY vote_type"
+SQL_GET_VOTE_STATE = "SELECT vote_type, COUNT(*), MAX(user_id = ?) FROM votes WHERE response_id = ? GROUP BY vote_type"
+SQL_APPLICATION_STATS = "SELECT status, COUNT(*) FROM applications GROUP BY status"
+SQL_DELETE_OLD_PROCESSED = (
+    "DELETE FROM processed_responses WHERE rowid IN "
+    "(SELECT rowid FROM processed_responses WHERE processed_at < ? LIMIT ?)"
+)
+SQL_EVENT_STATS = (
+    "SELECT COUNT(*),"
+    " COALESCE(SUM(CASE WHEN deleted = 0 THEN 1 ELSE 0 END), 0),"
+    " COALESCE(SUM(CASE WHEN deleted = 1 THEN 1 ELSE 0 END), 0),"
+    " AVG(CASE WHEN deleted = 1 THEN participant_count END)"
+    " FROM events"
+)
+SQL_HAS_ACTIVE_EVENT = "SELECT EXISTS(SELECT 1 FROM events WHERE deleted = 0)"
+SQL_GET_ACTIVE_EVENTS = "SELECT event_id, event_date FROM events WHERE deleted = 0"
+SQL_MARK_EVENT_DELETED = "UPDATE events SET deleted = 1 WHERE event_id = ?"
+SQL_SET_PARTICIPANT_COUNT = "UPDATE events SET participant_count = ? WHERE event_id = ?"
+SQL_GET_EVENT_PARTICIPANTS = "SELECT user_id FROM event_participants WHERE event_id = ?"
+SQL_ADD_EVENT_PARTICIPANT = "INSERT OR IGNORE INTO event_participants (event_id, user_id) VALUES (?, ?)"
+SQL_REMOVE_EVENT_PARTICIPANT = "DELETE FROM event_participants WHERE event_id = ? AND user_id = ?"
+SQL_REFRESH_PARTICIPANT_COUNT = (
+    "UPDATE events SET participant_count = (SELECT COUNT(*) FROM event_participants WHERE event_id = ?) WHERE event_id = ?"
+)
+
+# Run once on every new read connection (with parameters that match nothing) so these
+# are already prepared in its statement cache when the first real lookup arrives
+WARM_READ_STATEMENTS = (
+    (SQL_IS_PROCESSED, ("",)),
+    (SQL_GET_APP_BY_MSG, (0,)),
+    (SQL_GET_VOTE_STATE, (0, "")),
+    (SQL_GET_VOTES, ("",)),
+    (SQL_HAS_ACTIVE_EVENT, ()),
+)
+
+
+class _LRUCache:
+    """Small thread-safe least-recently-used mapping"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate, keep=None):
+        """Drop every entry other than ``keep`` whose value matches ``predicate``"""
+        with self._lock:
+            for key in [k for k, v in self._data.items() if k != keep and predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _TransactionState(threading.local):
+    """Per-thread connection of the open transaction; the class defaults avoid getattr checks"""
+
+    conn: Optional[sqlite3.Connection] = None
+    # Cache updates held back until the open transaction commits
+    on_commit: Optional[list] = None
+
+
+# Blocking database calls from the cogs run here rather than on the loop's default
+# executor, so slow Google API calls cannot starve them (one thread per reader plus the writer)
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=READER_POOL_SIZE + 1, thread_name_prefix="tacbot-db")
+
+
+async def run_db(func, *args, **kwargs):
+    """Await a blocking Database call on the dedicated database thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, partial(func, *args, **kwargs))
+
+
 class Database:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or os.getenv("DATABASE_PATH", "tacbot.db")
-        self._lock = threading.RLock()  # Use RLock for better thread safety
+        self._lock = threading.RLock()  # Serializes use of the shared writer connection
+        self._local = _TransactionState()
+        self._writer = None
+        # In-memory databases are private to one connection, so everything goes through the writer
+        self._readers = None
+        if self.db_path not in ("", ":memory:") and not self.db_path.startswith("file:"):
+            # Slots start empty and are filled with a connection on first use. LIFO so a
+            # light load keeps reusing the same warm connection.
+            self._readers = queue.LifoQueue()
+            for _ in range(READER_POOL_SIZE):
+                self._readers.put(None)
+        # Processed response IDs (positive results only) and application rows by message ID
+        self._processed_cache = _LRUCache()
+        self._app_by_message_cache = _LRUCache()
+        self._initialized = False
         self._initialize_database()
 
-    def _get_connection(self):
-        """Get a thread-safe database connection with proper error handling"""
+    def _get_connection(self, read_only: bool = False):
+        """Open a new configured connection with proper error handling"""
         try:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            database, uri = self.db_path, False
+            if read_only:
+                database, uri = f"{Path(self.db_path).absolute().as_uri()}?mode=ro", True
+            # Autocommit: the driver never opens transactions implicitly; writes that need
+            # one start it explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(database, uri=uri, check_same_thread=False, cached_statements=256, isolation_level=None)
             conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
+            if read_only:
+                # Readers only open once the schema exists
+                for query, params in WARM_READ_STATEMENTS:
+                    conn.execute(query, params).fetchall()
             return conn
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
             raise
 
+    def _get_writer(self):
+        """Return the shared writer connection, opening it on first use. Caller must hold _lock."""
+        if self._writer is None:
+            self._writer = self._get_connection()
+        return self._writer
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool, blocking while all are in use"""
+        conn = self._readers.get()
+        try:
+            if conn is None:
+                conn = self._get_connection(read_only=True)
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @staticmethod
+    def _run_statement(conn, query: str, params, fetch_one: bool, fetch_all: bool, commit: bool, many: bool, map_row):
+        """Execute one statement on conn and collect its result"""
+        if many:
+            if not conn.in_transaction:
+                # Keep the whole batch in one transaction rather than one per row
+                conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.executemany(query, params)
+        else:
+            cursor = conn.execute(query, params)
+
+        if map_row is not None:
+            result = [map_row(row) for row in cursor]
+        elif fetch_one:
+            result = cursor.fetchone()
+            # Reset the statement so a pooled connection does not keep its read snapshot open
+            cursor.close()
+        elif fetch_all:
+            result = cursor.fetchall()
+        else:
+            result = cursor.rowcount
+
+        if commit and conn.in_transaction:
+            conn.commit()
+        return result
+
     def _execute_with_retry(
         self,
         query: str,
@@ -31,26 +292,38 @@ class Database:
         fetch_one: bool = False,
         fetch_all: bool = False,
         commit: bool = True,
+        many: bool = False,
+        map_row=None,
     ):
-        """Execute database operations with retry logic and proper error handling"""
-        max_retries = 3
+        """Execute database operations with retry logic and proper error handling
+
+        With many=True, params is a sequence of parameter tuples run through executemany.
+        With map_row, the result rows are converted while iterating the cursor instead of
+        being materialized by fetchall first.
+        Inside transaction() the statement runs on the transaction's connection and is
+        committed with it, so it is not retried on its own. Outside a transaction, SELECTs
+        run on a pooled read-only connection and everything else on the shared writer.
+        """
+        tx_conn = self._local.conn
+        max_retries = 1 if tx_conn is not None else 3
+        read_only = tx_conn is None and not many and self._readers is not None and query.lstrip()[:6].upper() == "SELECT"
         for attempt in range(max_retries):
-            conn = None
             try:
-                with self._lock:
-                    conn = self._get_connection()
-                    cursor = conn.cursor()
-                    cursor.execute(query, params)
-
-                    if commit:
-                        conn.commit()
+                if tx_conn is not None:
+                    return self._run_statement(tx_conn, query, params, fetch_one, fetch_all, False, many, map_row)
 
-                    if fetch_one:
-                        return cursor.fetchone()
-                    elif fetch_all:
-                        return cursor.fetchall()
+                if read_only:
+                    with self._reader() as conn:
+                        return self._run_statement(conn, query, params, fetch_one, fetch_all, False, many, map_row)
 
-                    return cursor.rowcount
+                with self._lock:
+                    conn = self._get_writer()
+                    try:
+                        return self._run_statement(conn, query, params, fetch_one, fetch_all, commit, many, map_row)
+                    except Exception:
+                        if conn.in_transaction:
+                            conn.rollback()
+                        raise
 
             except sqlite3.OperationalError as e:
                 logger.warning(
@@ -63,52 +336,191 @@ class Database:
             except Exception as e:
                 logger.error(f"Unexpected database error: {e}")
                 raise
+
+    @contextmanager
+    def transaction(self):
+        """Run the Database calls made in this block on this thread as one atomic transaction.
+
+        Commits when the block exits and rolls back if it raises. Nested blocks join the
+        outer transaction. Methods that log and swallow their own errors do not trigger a rollback.
+        """
+        if self._local.conn is not None:
+            yield self._local.conn
+            return
+
+        with self._lock:
+            conn = self._get_writer()
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            self._local.on_commit = on_commit = []
+            try:
+                with conn:
+                    yield conn
+                # A rolled-back transaction never gets here, so the caches only see committed rows
+                for update in on_commit:
+                    update()
             finally:
-                if conn:
-                    conn.close()
+                self._local.conn = None
+                self._local.on_commit = None
+
+    def _after_commit(self, update, now: bool = False):
+        """Apply a cache update at once, or once this thread's open transaction commits
+
+        ``now`` also applies it immediately; evictions use it so reads inside the transaction miss the old entry.
+        """
+        if self._local.conn is None:
+            update()
+            return
+        if now:
+            update()
+        self._local.on_commit.append(update)
 
     def _initialize_database(self):
-        """Create database tables if they don't exist"""
+        """Create or migrate the schema if it is out of date. Runs once per Database instance."""
+        if self._initialized:
+            return
         try:
-            # Table for tracking processed responses
-            self._execute_with_retry(
-                """
-                CREATE TABLE IF NOT EXISTS processed_responses (
-                    response_id TEXT PRIMARY KEY,
-                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+            # Write-ahead logging lets readers proceed while a write commits
+            self._execute_with_retry("PRAGMA journal_mode=WAL", fetch_one=True)
+
+            # An up-to-date database needs no DDL at all
+            version = self._execute_with_retry("PRAGMA user_version", fetch_one=True)[0]
+            if version < SCHEMA_VERSION:
+                logger.info(f"Upgrading database schema from version {version} to {SCHEMA_VERSION}")
+                with self.transaction():
+                    self._create_schema()
+                    self._execute_with_retry(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+                # Give the planner statistics for the new indexes
+                self._execute_with_retry("ANALYZE")
+
+            self._initialized = True
+            self._seed_processed_cache()
+            logger.info("Database initialized successfully")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize database: {e}")
+            raise
+
+    def _create_schema(self):
+        """Create missing tables and indexes and migrate legacy data. Idempotent."""
+        # Table for tracking processed responses
+        self._execute_with_retry(
+            """
+            CREATE TABLE IF NOT EXISTS processed_responses (
+                response_id TEXT PRIMARY KEY,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        # Cleanup and the startup cache seed both range over processed_at
+        self._execute_with_retry("CREATE INDEX IF NOT EXISTS idx_processed_at ON processed_responses(processed_at)")
+
+        # Table for application messages and their status
+        self._execute_with_retry(f"CREATE TABLE IF NOT EXISTS applications ({APPLICATIONS_SCHEMA})")
+        self._migrate_text_status()
+
+        # Vote buttons look applications up by their Discord message
+        self._execute_with_retry("CREATE INDEX IF NOT EXISTS idx_applications_message_id ON applications(message_id)")
+
+        # Staff votes on applications
+        self._execute_with_retry(
+            """
+            CREATE TABLE IF NOT EXISTS votes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                response_id TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                vote_type TEXT NOT NULL CHECK (vote_type IN ('approve', 'deny')),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(response_id, user_id)
+            )
+        """
+        )
+        self._migrate_application_votes()
+        # Covers get_vote_counts; per-user lookups use the UNIQUE index
+        self._execute_with_retry("CREATE INDEX IF NOT EXISTS idx_votes_response ON votes(response_id, vote_type)")
+
+        # Scheduled events
+        self._execute_with_retry(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                event_id INTEGER PRIMARY KEY,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                event_date DATE,
+                participant_count INTEGER DEFAULT 0,
+                participant_names TEXT DEFAULT '',
+                deleted INTEGER DEFAULT 0
+            )
+        """
+        )
+        # One row per participant; the primary key also serves lookups by event_id.
+        # participant_names above is kept, untouched, for rows written before this table existed;
+        # those hold display names, not user IDs, so they are never copied into user_id.
+        self._execute_with_retry(
             """
+            CREATE TABLE IF NOT EXISTS event_participants (
+                event_id INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (event_id, user_id)
             )
+        """
+        )
+        self._execute_with_retry("CREATE INDEX IF NOT EXISTS idx_events_active ON events(deleted, created_at DESC)")
 
-            # Table for application messages and their status
+    def _seed_processed_cache(self):
+        """Load the most recently processed response IDs so the first poll after startup stays in memory"""
+        try:
+            recent = self._execute_with_retry(SQL_RECENT_PROCESSED, (self._processed_cache.maxsize,), map_row=lambda row: row[0])
+            # Oldest first, so the newest IDs end up most recently used
+            for response_id in reversed(recent):
+                self._processed_cache.put(response_id, True)
+        except Exception as e:
+            logger.warning(f"Could not preload processed responses: {e}")
+
+    def _migrate_text_status(self):
+        """Rebuild an applications table created with the old free-form TEXT status column"""
+        columns = self._execute_with_retry("PRAGMA table_info(applications)", fetch_all=True)
+        if not any(column["name"] == "status" and column["type"].upper() == "TEXT" for column in columns):
+            return
+
+        logger.info("Migrating applications.status from TEXT to INTEGER")
+        with self.transaction():
+            self._execute_with_retry("DROP TABLE IF EXISTS applications_migrated")
+            self._execute_with_retry(f"CREATE TABLE applications_migrated ({APPLICATIONS_SCHEMA})")
             self._execute_with_retry(
                 """
-                CREATE TABLE IF NOT EXISTS applications (
-                    response_id TEXT PRIMARY KEY,
-                    message_id INTEGER,
-                    channel_id INTEGER,
-                    status TEXT DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                INSERT INTO applications_migrated (response_id, message_id, channel_id, status, created_at, updated_at)
+                SELECT response_id, message_id, channel_id,
+                    CASE WHEN status IN ('accept', 'accepted') THEN 1 WHEN status IN ('deny', 'denied') THEN 2 ELSE 0 END,
+                    created_at, updated_at
+                FROM applications
             """
             )
+            self._execute_with_retry("DROP TABLE applications")
+            self._execute_with_retry("ALTER TABLE applications_migrated RENAME TO applications")
 
-            logger.info("Database initialized successfully")
-
-        except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
-            raise
+    @staticmethod
+    def _application_row(row) -> Dict[str, Any]:
+        """Convert an applications row to a dict with the status as its name"""
+        data = dict(row)
+        data["status"] = ApplicationStatus(data["status"]).label
+        return data
 
     def is_response_processed(self, response_id: str) -> bool:
         """Check if a response has already been processed"""
+        if self._processed_cache.get(response_id):
+            return True
         try:
             result = self._execute_with_retry(
-                "SELECT 1 FROM processed_responses WHERE response_id = ?",
+                SQL_IS_PROCESSED,
                 (response_id,),
                 fetch_one=True,
             )
-            return result is not None
+            processed = bool(result[0])
+            if processed:
+                self._after_commit(partial(self._processed_cache.put, response_id, True))
+            return processed
 
         except Exception as e:
             logger.error(f"Error checking if response is processed: {e}")
@@ -117,56 +529,128 @@ class Database:
     def mark_response_processed(self, response_id: str):
         """Mark a response as processed"""
         try:
-            self._execute_with_retry("INSERT OR IGNORE INTO processed_responses (response_id) VALUES (?)", (response_id,))
+            self._execute_with_retry(SQL_MARK_PROCESSED, (response_id,))
+            self._after_commit(partial(self._processed_cache.put, response_id, True))
 
         except Exception as e:
             logger.error(f"Error marking response as processed: {e}")
 
-    def store_application_message(self, response_id: str, message_id: int, channel_id: int):
-        """Store information about an application message"""
+    def batch_mark_responses_processed(self, response_ids: Iterable[str]):
+        """Mark many responses as processed in a single transaction"""
+        rows = [(response_id,) for response_id in response_ids]
+        if not rows:
+            return
         try:
-            self._execute_with_retry(
-                """
-                INSERT OR REPLACE INTO applications
-                (response_id, message_id, channel_id, status, updated_at)
-                VALUES (?, ?, ?, 'pending', CURRENT_TIMESTAMP)
-            """,
-                (response_id, message_id, channel_id),
-            )
+            self._execute_with_retry(SQL_MARK_PROCESSED, rows, many=True)
+
+            def cache_processed():
+                for (response_id,) in rows:
+                    self._processed_cache.put(response_id, True)
+
+            self._after_commit(cache_processed)
+
+        except Exception as e:
+            logger.error(f"Error marking {len(rows)} responses as processed: {e}")
+
+    def _write_application(self, query: str, params: tuple, response_id: str, moves_message: bool = False) -> Optional[Dict[str, Any]]:
+        """Run a single-row applications write and return the row as written
+
+        ``moves_message`` marks writes that may give the response a new message ID.
+        """
+        if SQLITE_HAS_RETURNING:
+            # Iterate to completion so the write finishes before the connection closes
+            rows = self._execute_with_retry(f"{query} RETURNING {APPLICATION_COLUMNS}", params, map_row=self._application_row)
+            row = rows[0] if rows else None
+        else:
+            self._execute_with_retry(query, params)
+            row = self.get_application_status(response_id)
+
+        if not row:
+            return row
+        if moves_message:
+            # The previous row may still be cached under its old message ID
+            evict = partial(self._app_by_message_cache.pop_where, lambda cached: cached["response_id"] == response_id, keep=row["message_id"])
+            self._after_commit(evict, now=True)
+        if row.get("message_id") is not None:
+            self._after_commit(partial(self._app_by_message_cache.put, row["message_id"], dict(row)))
+        return row
+
+    def store_application_message(self, response_id: str, message_id: int, channel_id: int) -> Optional[Dict[str, Any]]:
+        """Store information about an application message and return the stored row"""
+        try:
+            return self._write_application(SQL_STORE_APPLICATION, (response_id, message_id, channel_id), response_id, moves_message=True)
 
         except Exception as e:
             logger.error(f"Error storing application message: {e}")
+            return None
+
+    def store_posted_application(self, response_id: str, message_id: int, channel_id: int) -> Optional[Dict[str, Any]]:
+        """Store a just-posted application message and mark its response processed in one transaction"""
+        try:
+            with self.transaction():
+                row = self._write_application(SQL_STORE_APPLICATION, (response_id, message_id, channel_id), response_id, moves_message=True)
+                self._execute_with_retry(SQL_MARK_PROCESSED, (response_id,))
+                self._after_commit(partial(self._processed_cache.put, response_id, True))
+            return row
+
+        except Exception as e:
+            logger.error(f"Error storing posted application {response_id}: {e}")
+            return None
+
+    def batch_store_applications(self, applications: Iterable[Tuple[str, int, int]]):
+        """Store many (response_id, message_id, channel_id) rows in a single transaction"""
+        rows = list(applications)
+        if not rows:
+            return
+        try:
+            self._execute_with_retry(SQL_STORE_APPLICATION, rows, many=True)
+            self._after_commit(self._app_by_message_cache.clear, now=True)
+
+        except Exception as e:
+            logger.error(f"Error storing {len(rows)} application messages: {e}")
 
     def get_application_by_message_id(self, message_id: int) -> Optional[Dict[str, Any]]:
         """Get application data by Discord message ID"""
         try:
-            row = self._execute_with_retry("SELECT * FROM applications WHERE message_id = ?", (message_id,), fetch_one=True)
-            return dict(row) if row else None
+            cached = self._app_by_message_cache.get(message_id)
+            if cached is not None:
+                return dict(cached)
+
+            row = self._execute_with_retry(SQL_GET_APP_BY_MSG, (message_id,), fetch_one=True)
+            if not row:
+                return None
+            data = self._application_row(row)
+            self._after_commit(partial(self._app_by_message_cache.put, message_id, data))
+            return dict(data)
 
         except Exception as e:
             logger.error(f"Error getting application by message ID: {e}")
             return None
 
-    def set_application_status(self, response_id: str, status: str):
-        """Update the status of an application"""
+    def get_pending_applications(self) -> list:
+        """Get (response_id, message_id) pairs for applications still awaiting a decision"""
         try:
-            self._execute_with_retry(
-                """
-                UPDATE applications
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE response_id = ?
-            """,
-                (status, response_id),
-            )
+            return self._execute_with_retry(SQL_GET_PENDING_APPS, (int(ApplicationStatus.PENDING),), map_row=tuple)
+
+        except Exception as e:
+            logger.error(f"Error getting pending applications: {e}")
+            return []
+
+    def set_application_status(self, response_id: str, status) -> Optional[Dict[str, Any]]:
+        """Update the status of an application and return the updated row, or None if there is none"""
+        try:
+            status = ApplicationStatus.parse(status)
+            return self._write_application(SQL_SET_APP_STATUS, (int(status), response_id), response_id)
 
         except Exception as e:
             logger.error(f"Error updating application status: {e}")
+            return None
 
     def get_application_status(self, response_id: str) -> Optional[Dict[str, Any]]:
         """Get the status of an application"""
         try:
-            row = self._execute_with_retry("SELECT * FROM applications WHERE response_id = ?", (response_id,), fetch_one=True)
-            return dict(row) if row else None
+            row = self._execute_with_retry(SQL_GET_APP_BY_RESPONSE, (response_id,), fetch_one=True)
+            return self._application_row(row) if row else None
 
         except Exception as e:
             logger.error(f"Error getting application status: {e}")
@@ -175,20 +659,7 @@ class Database:
     def record_vote(self, response_id: str, user_id: int, vote: str):
         """Record a vote on an application"""
         try:
-            # Remove any existing vote from this user for this application
-            self._execute_with_retry(
-                "DELETE FROM application_votes WHERE response_id = ? AND user_id = ?",
-                (response_id, user_id),
-            )
-
-            # Insert the new vote
-            self._execute_with_retry(
-                """
-                INSERT INTO application_votes (response_id, user_id, vote)
-                VALUES (?, ?, ?)
-            """,
-                (response_id, user_id, vote),
-            )
+            self.set_vote(response_id, user_id, vote)
 
         except Exception as e:
             logger.error(f"Error recording vote: {e}")
@@ -196,72 +667,93 @@ class Database:
     def cleanup_old_data(self, days: int = 30):
         """Clean up old processed responses (optional maintenance)"""
         try:
-            self._execute_with_retry(
-                """
-                DELETE FROM processed_responses
-                WHERE processed_at < datetime('now', ? || ' days')
-            """,
-                (f"-{days}",),
-            )
-
-            logger.info(f"Cleaned up old data older than {days} days")
+            # Same format as CURRENT_TIMESTAMP, so the comparison can use idx_processed_at
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+            deleted = 0
+            while True:
+                count = self._execute_with_retry(SQL_DELETE_OLD_PROCESSED, (cutoff, CLEANUP_CHUNK_SIZE))
+                deleted += count
+                if count:
+                    self._after_commit(self._processed_cache.clear, now=True)
+                if count < CLEANUP_CHUNK_SIZE:
+                    break
+
+            logger.info(f"Cleaned up {deleted} processed responses older than {days} days")
+            if deleted:
+                self.rebuild_stats()
+
+            # Fold the WAL back into the database and truncate it, so readers don't
+            # have to search an ever-growing log between automatic checkpoints
+            self._execute_with_retry("PRAGMA wal_checkpoint(TRUNCATE)", fetch_one=True)
 
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
 
+    def rebuild_stats(self):
+        """Refresh the query planner's table statistics after bulk changes"""
+        try:
+            self._execute_with_retry("ANALYZE")
+        except Exception as e:
+            logger.error(f"Error rebuilding database statistics: {e}")
+
     # ===== NEW METHODS FOR IMPROVED APPLICATION HANDLER =====
 
     def initialize_applications_table(self):
-        """Initialize the applications table (already exists above, but keeping for API consistency)"""
-        # This is already handled in _initialize_database, but keeping for API
-        # consistency
-        pass
+        """Kept for API compatibility; the table is created by _initialize_database"""
 
     def initialize_votes_table(self):
-        """Initialize the votes table for application voting."""
-        try:
+        """Kept for API compatibility; the table is created by _initialize_database"""
+
+    def _migrate_application_votes(self):
+        """Fold votes from the legacy application_votes table into votes and drop it"""
+        legacy = self._execute_with_retry(
+            "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'application_votes')", fetch_one=True
+        )
+        if not legacy[0]:
+            return
+
+        logger.info("Migrating application_votes into votes")
+        with self.transaction():
             self._execute_with_retry(
                 """
-                CREATE TABLE IF NOT EXISTS votes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    response_id TEXT NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    vote_type TEXT NOT NULL CHECK (vote_type IN ('approve', 'deny')),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(response_id, user_id)
-                )
+                INSERT OR IGNORE INTO votes (response_id, user_id, vote_type)
+                SELECT response_id, user_id, vote FROM application_votes
+                WHERE vote IN ('approve', 'deny')
             """
             )
-            logger.info("Votes table initialized")
-        except Exception as e:
-            logger.error(f"Error initializing votes table: {e}")
-            raise
+            self._execute_with_retry("DROP TABLE application_votes")
 
     def add_vote(self, response_id: str, user_id: int, vote_type: str):
         """Add a new vote for an application."""
         try:
-            self._execute_with_retry(
-                """
-                INSERT INTO votes (response_id, user_id, vote_type)
-                VALUES (?, ?, ?)
-            """,
-                (response_id, user_id, vote_type),
-            )
+            self._execute_with_retry(SQL_ADD_VOTE, (response_id, user_id, vote_type))
         except Exception as e:
             logger.error(f"Error adding vote: {e}")
             raise
 
+    def set_vote(self, response_id: str, user_id: int, vote_type: str):
+        """Add a vote, or replace the user's existing vote, in a single statement."""
+        try:
+            self._execute_with_retry(SQL_SET_VOTE, (response_id, user_id, vote_type))
+        except Exception as e:
+            logger.error(f"Error setting vote: {e}")
+            raise
+
+    def record_votes(self, votes: Iterable[Tuple[str, int, str]]):
+        """Upsert many (response_id, user_id, vote_type) votes in a single transaction."""
+        rows = list(votes)
+        if not rows:
+            return
+        try:
+            self._execute_with_retry(SQL_SET_VOTE, rows, many=True)
+        except Exception as e:
+            logger.error(f"Error recording {len(rows)} votes: {e}")
+            raise
+
     def update_vote(self, response_id: str, user_id: int, vote_type: str):
         """Update an existing vote."""
         try:
-            self._execute_with_retry(
-                """
-                UPDATE votes
-                SET vote_type = ?, created_at = CURRENT_TIMESTAMP
-                WHERE response_id = ? AND user_id = ?
-            """,
-                (vote_type, response_id, user_id),
-            )
+            self._execute_with_retry(SQL_UPDATE_VOTE, (vote_type, response_id, user_id))
         except Exception as e:
             logger.error(f"Error updating vote: {e}")
             raise
@@ -269,13 +761,7 @@ class Database:
     def remove_vote(self, response_id: str, user_id: int):
         """Remove a vote from an application."""
         try:
-            self._execute_with_retry(
-                """
-                DELETE FROM votes
-                WHERE response_id = ? AND user_id = ?
-            """,
-                (response_id, user_id),
-            )
+            self._execute_with_retry(SQL_REMOVE_VOTE, (response_id, user_id))
         except Exception as e:
             logger.error(f"Error removing vote: {e}")
             raise
@@ -283,32 +769,16 @@ class Database:
     def get_user_vote(self, response_id: str, user_id: int) -> Optional[str]:
         """Get a user's current vote for an application."""
         try:
-            result = self._execute_with_retry(
-                """
-                SELECT vote_type FROM votes
-                WHERE response_id = ? AND user_id = ?
-            """,
-                (response_id, user_id),
-                fetch_one=True,
-            )
+            result = self._execute_with_retry(SQL_GET_USER_VOTE, (response_id, user_id), fetch_one=True)
             return result[0] if result else None
         except Exception as e:
             logger.error(f"Error getting user vote: {e}")
             return None
 
     def get_votes(self, response_id: str) -> list:
-        """Get all votes for an application."""
+        """Get all votes for an application as (user_id, vote_type) pairs, newest first."""
         try:
-            rows = self._execute_with_retry(
-                """
-                SELECT user_id, vote_type, created_at FROM votes
-                WHERE response_id = ?
-                ORDER BY created_at DESC
-            """,
-                (response_id,),
-                fetch_all=True,
-            )
-            return [{"user_id": row[0], "vote_type": row[1], "created_at": row[2]} for row in rows]
+            return self._execute_with_retry(SQL_GET_VOTES, (response_id,), map_row=tuple)
         except Exception as e:
             logger.error(f"Error getting votes: {e}")
             return []
@@ -316,63 +786,32 @@ class Database:
     def get_vote_counts(self, response_id: str) -> dict:
         """Get vote counts for an application."""
         try:
-            rows = self._execute_with_retry(
-                """
-                SELECT vote_type, COUNT(*) FROM votes
-                WHERE response_id = ?
-                GROUP BY vote_type
-            """,
-                (response_id,),
-                fetch_all=True,
-            )
-            return {row[0]: row[1] for row in rows}
+            # Answered from the (response_id, vote_type) index without touching the table
+            return dict(self._execute_with_retry(SQL_GET_VOTE_COUNTS, (response_id,), map_row=tuple))
         except Exception as e:
             logger.error(f"Error getting vote counts: {e}")
             return {}
 
-    def get_application_stats(self) -> dict:
-        """Get application statistics with proper SQL parameterization."""
+    def get_vote_state(self, response_id: str, user_id: int) -> dict:
+        """Get vote counts and the user's current vote for an application in one query."""
         try:
-            stats = {}
-
-            # Use parameterized queries and proper error handling
-            total_result = self._execute_with_retry("SELECT COUNT(*) FROM applications", fetch_one=True)
-            stats["total"] = total_result[0] if total_result else 0
-
-            # Status breakdown with CASE normalization
-            status_results = self._execute_with_retry(
-                """
-                SELECT
-                    CASE
-                        WHEN status = ? THEN ?
-                        WHEN status = ? THEN ?
-                        ELSE status
-                    END as normalized_status,
-                    COUNT(*)
-                FROM applications
-                WHERE status IS NOT NULL AND status != ?
-                GROUP BY normalized_status
-            """,
-                ("accept", "accepted", "deny", "denied", "pending"),
-                fetch_all=True,
-            )
-
-            for status, count in status_results:
-                stats[status] = count
-
-            # Ensure all expected keys exist
-            for key in ["accepted", "denied"]:
-                if key not in stats:
-                    stats[key] = 0
-
-            # Pending count
-            pending_result = self._execute_with_retry(
-                "SELECT COUNT(*) FROM applications WHERE status IS NULL OR status = ?",
-                ("pending",),
-                fetch_one=True,
-            )
-            stats["pending"] = pending_result[0] if pending_result else 0
+            state = {"approve": 0, "deny": 0, "my_vote": None}
+            for vote_type, count, is_mine in self._execute_with_retry(SQL_GET_VOTE_STATE, (user_id, response_id), map_row=tuple):
+                state[vote_type] = count
+                if is_mine:
+                    state["my_vote"] = vote_type
+            return state
+        except Exception as e:
+            logger.error(f"Error getting vote state: {e}")
+            return {"approve": 0, "deny": 0, "my_vote": None}
 
+    def get_application_stats(self) -> dict:
+        """Get application statistics in a single pass over the applications table."""
+        try:
+            stats = {status.label: 0 for status in ApplicationStatus}
+            for status, count in self._execute_with_retry(SQL_APPLICATION_STATS, map_row=tuple):
+                stats[ApplicationStatus(status).label] = count
+            stats["total"] = sum(stats.values())
             return stats
 
         except Exception as e:
@@ -382,30 +821,13 @@ class Database:
     # ===== EXISTING EVENT METHODS (keeping them as they are) =====
 
     def initialize_events_table(self):
-        """Initialize the events table"""
-        try:
-            self._execute_with_retry(
-                """
-                CREATE TABLE IF NOT EXISTS events (
-                    event_id INTEGER PRIMARY KEY,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    event_date DATE,
-                    participant_count INTEGER DEFAULT 0,
-                    participant_names TEXT DEFAULT '',
-                    deleted INTEGER DEFAULT 0
-                )
-            """
-            )
-
-            logger.info("Events table initialized")
-        except Exception as e:
-            logger.error(f"Error initializing events table: {e}")
+        """Kept for API compatibility; the table is created by _initialize_database"""
 
     def has_active_event(self) -> bool:
         """Check if there's an active event"""
         try:
-            result = self._execute_with_retry("SELECT COUNT(*) FROM events WHERE deleted = 0", fetch_one=True)
-            return result[0] > 0
+            result = self._execute_with_retry(SQL_HAS_ACTIVE_EVENT, fetch_one=True)
+            return bool(result[0])
         except Exception as e:
             logger.error(f"Error checking active event: {e}")
             return False
@@ -426,11 +848,11 @@ class Database:
     def get_active_event(self):
         """Get active event"""
         try:
-            row = self._execute_with_retry(
+            # A sqlite3.Row already supports access by column name
+            return self._execute_with_retry(
                 "SELECT * FROM events WHERE deleted = 0 ORDER BY created_at DESC LIMIT 1",
                 fetch_one=True,
             )
-            return dict(row) if row else None
         except Exception as e:
             logger.error(f"Error getting active event: {e}")
             return None
@@ -438,72 +860,69 @@ class Database:
     def get_all_active_events(self) -> list:
         """Get all active events from the database."""
         try:
-            rows = self._execute_with_retry(
-                """
-                SELECT event_id, event_date FROM events
-                WHERE deleted = 0
-            """,
-                fetch_all=True,
-            )
-            return [{"event_id": row[0], "event_date": row[1]} for row in rows]
+            return self._execute_with_retry(SQL_GET_ACTIVE_EVENTS, fetch_all=True)
         except Exception as e:
             logger.error(f"Error getting active events: {e}")
             return []
 
     def update_event_participants(self, event_id: int, count: int, users: list):
-        """Update event participants"""
+        """Update event participants, writing only the users added or removed since the last update"""
         try:
-            users_str = ",".join(users) if users else ""
-            self._execute_with_retry(
-                """
-                UPDATE events
-                SET participant_count = ?, participant_names = ?
-                WHERE event_id = ?
-            """,
-                (count, users_str, event_id),
-            )
+            users = {str(user) for user in users or ()}
+            with self.transaction():
+                current = set(self._execute_with_retry(SQL_GET_EVENT_PARTICIPANTS, (event_id,), map_row=lambda row: row[0]))
+                removed = [(event_id, user) for user in current - users]
+                added = [(event_id, user) for user in users - current]
+                if removed:
+                    self._execute_with_retry(SQL_REMOVE_EVENT_PARTICIPANT, removed, many=True)
+                if added:
+                    self._execute_with_retry(SQL_ADD_EVENT_PARTICIPANT, added, many=True)
+                self._execute_with_retry(SQL_SET_PARTICIPANT_COUNT, (count, event_id))
         except Exception as e:
             logger.error(f"Error updating participants: {e}")
 
+    def add_event_participant(self, event_id: int, user_id):
+        """Record one participant and refresh the event's participant count"""
+        try:
+            with self.transaction():
+                self._execute_with_retry(SQL_ADD_EVENT_PARTICIPANT, (event_id, str(user_id)))
+                self._execute_with_retry(SQL_REFRESH_PARTICIPANT_COUNT, (event_id, event_id))
+        except Exception as e:
+            logger.error(f"Error adding participant: {e}")
+
+    def remove_event_participant(self, event_id: int, user_id):
+        """Remove one participant and refresh the event's participant count"""
+        try:
+            with self.transaction():
+                self._execute_with_retry(SQL_REMOVE_EVENT_PARTICIPANT, (event_id, str(user_id)))
+                self._execute_with_retry(SQL_REFRESH_PARTICIPANT_COUNT, (event_id, event_id))
+        except Exception as e:
+            logger.error(f"Error removing participant: {e}")
+
+    def get_event_participants(self, event_id: int) -> list:
+        """Get the user IDs recorded as participants of an event"""
+        try:
+            return self._execute_with_retry(SQL_GET_EVENT_PARTICIPANTS, (event_id,), map_row=lambda row: row[0])
+        except Exception as e:
+            logger.error(f"Error getting participants: {e}")
+            return []
+
     def mark_event_deleted(self, event_id: int):
         """Mark event as deleted"""
         try:
-            self._execute_with_retry(
-                """
-                UPDATE events SET deleted = 1 WHERE event_id = ?
-            """,
-                (event_id,),
-            )
+            self._execute_with_retry(SQL_MARK_EVENT_DELETED, (event_id,))
         except Exception as e:
             logger.error(f"Error marking event deleted: {e}")
 
     def get_event_stats(self) -> dict:
         """Get event statistics."""
         try:
-            stats = {}
-
-            # Total events created
-            total_result = self._execute_with_retry("SELECT COUNT(*) FROM events", fetch_one=True)
-            stats["total_events"] = total_result[0] if total_result else 0
-
-            # Active events
-            active_result = self._execute_with_retry("SELECT COUNT(*) FROM events WHERE deleted = 0", fetch_one=True)
-            stats["active_events"] = active_result[0] if active_result else 0
-
-            # Completed events
-            completed_result = self._execute_with_retry("SELECT COUNT(*) FROM events WHERE deleted = 1", fetch_one=True)
-            stats["completed_events"] = completed_result[0] if completed_result else 0
+            total, active, completed, avg_participants = self._execute_with_retry(SQL_EVENT_STATS, fetch_one=True)
+            stats = {"total_events": total, "active_events": active, "completed_events": completed}
 
             # Average participants for completed events
-            avg_result = self._execute_with_retry(
-                """
-                SELECT AVG(participant_count) FROM events
-                WHERE deleted = 1 AND participant_count IS NOT NULL
-            """,
-                fetch_one=True,
-            )
-            if avg_result and avg_result[0]:
-                stats["avg_participants"] = float(avg_result[0])
+            if avg_participants:
+                stats["avg_participants"] = float(avg_participants)
 
             return stats
         except Exception as e:
@@ -511,7 +930,26 @@ class Database:
             return {}
 
     def close(self):
-        """Close database connection"""
-        # With the new connection handling, there's no persistent connection to close
-        # But keeping this method for API compatibility
-        pass
+        """Close any idle pooled reader connections and the writer"""
+        # Readers go first so the writer is the last connection and can checkpoint and remove the WAL
+        if self._readers is not None:
+            idle = []
+            while True:
+                try:
+                    idle.append(self._readers.get_nowait())
+                except queue.Empty:
+                    break  # Borrowed readers return to the pool when released
+            for conn in idle:
+                if conn is not None:
+                    conn.close()
+                self._readers.put(None)
+
+        with self._lock:
+            if self._writer is not None:
+                try:
+                    # Lets SQLite refresh any statistics the recent workload showed to be stale
+                    self._writer.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.warning(f"PRAGMA optimize failed on close: {e}")
+                self._writer.close()
+                self._writer = None
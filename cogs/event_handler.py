@@ -1,14 +1,21 @@
+import asyncio
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from datetime import datetime, timedelta, time
-import pytz
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import os
 import logging
 from typing import Optional
-from .database import Database
+from .database import Database, run_db
 
 logger = logging.getLogger(__name__)
 
+# Scheduled events checked against Discord at once during startup cleanup
+STALE_CHECK_CONCURRENCY = 5
+
+# Longest single sleep in the schedule loop, so a changed system clock is noticed within hours
+MAX_SCHEDULE_SLEEP = 6 * 60 * 60
+
 
 class EventHandler(commands.Cog):
     """Handles automatic Discord event creation and management."""
@@ -21,15 +28,8 @@ class EventHandler(commands.Cog):
         self._load_config()
         self._validate_config()
 
-        # Initialize database table
-        self.db.initialize_events_table()
-
-        # Track last execution times to prevent duplicate operations
-        self._last_create_check = None
-        self._last_delete_check = None
-
-        # Start the scheduled tasks
-        self.check_event_schedule.start()
+        # Started in cog_load
+        self._schedule_task = None
 
     def _load_config(self):
         """Load configuration from environment variables."""
@@ -49,15 +49,12 @@ class EventHandler(commands.Cog):
 
             # Timezone configuration
             timezone_str = os.getenv("TIMEZONE")
-            self.timezone = pytz.timezone(timezone_str)
-
-            # Task interval configuration
-            self.check_interval = int(os.getenv("EVENT_CHECK_INTERVAL", "5"))  # 5 minutes
+            self.timezone = ZoneInfo(timezone_str)
 
         except (ValueError, TypeError) as e:
             logger.error(f"Invalid configuration value: {e}")
             raise
-        except pytz.UnknownTimeZoneError as e:
+        except ZoneInfoNotFoundError as e:
             logger.error(f"Invalid timezone: {e}")
             raise
 
@@ -103,19 +100,23 @@ class EventHandler(commands.Cog):
                             self.timezone})"
         )
 
+    _DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
     def _day_name(self, day_num: int) -> str:
         """Convert day number to name."""
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        return days[day_num] if 0 <= day_num <= 6 else "Unknown"
+        return self._DAY_NAMES[day_num] if 0 <= day_num <= 6 else "Unknown"
 
     def cog_unload(self):
         """Cleanup when cog is unloaded."""
-        self.check_event_schedule.cancel()
+        if self._schedule_task:
+            self._schedule_task.cancel()
+        self.db.close()
         logger.info("EventHandler cog unloaded")
 
     async def cog_load(self):
         """Initialize when cog is loaded."""
         await self._cleanup_stale_events()
+        self._schedule_task = asyncio.create_task(self._schedule_loop())
         logger.info("EventHandler cog loaded")
 
     async def _cleanup_stale_events(self):
@@ -130,71 +131,82 @@ class EventHandler(commands.Cog):
                 return
 
             # Get all active events from database
-            active_events = self.db.get_all_active_events()
-
-            for event_data in active_events:
-                event_id = event_data["event_id"]
-                try:
-                    # Check if event still exists on Discord
-                    await guild.fetch_scheduled_event(event_id)
-                    logger.debug(f"Event {event_id} still exists on Discord")
-                except discord.NotFound:
-                    # Event doesn't exist on Discord, mark as deleted in
-                    # database
-                    logger.info(f"Marking stale event {event_id} as deleted")
-                    self.db.mark_event_deleted(event_id)
-                except discord.HTTPException as e:
-                    logger.warning(f"Could not check event {event_id}: {e}")
+            active_events = await run_db(self.db.get_all_active_events)
 
-            logger.info("Completed stale event cleanup")
+            # Events in the gateway cache still exist; ask Discord about the rest, a few requests at a time
+            semaphore = asyncio.Semaphore(STALE_CHECK_CONCURRENCY)
 
-        except Exception as e:
-            logger.error(f"Error during stale event cleanup: {e}")
+            async def fetch(event_id):
+                async with semaphore:
+                    return await guild.fetch_scheduled_event(event_id)
 
-    @tasks.loop(minutes=5)  # Default 5 minutes, configurable
-    async def check_event_schedule(self):
-        """Check if we need to create or delete events."""
-        try:
-            now = datetime.now(self.timezone)
-            current_time_key = now.strftime("%Y-%m-%d-%H")
+            event_ids = [event_data["event_id"] for event_data in active_events if not guild.get_scheduled_event(event_data["event_id"])]
+            results = await asyncio.gather(*(fetch(event_id) for event_id in event_ids), return_exceptions=True)
 
-            # Check if we need to create a new event
-            if self._should_create_event(now, current_time_key):
-                await self._create_weekly_event()
-                self._last_create_check = current_time_key
+            for event_id, result in zip(event_ids, results):
+                if isinstance(result, discord.NotFound):
+                    # Event doesn't exist on Discord, mark as deleted in database
+                    logger.info(f"Marking stale event {event_id} as deleted")
+                    await run_db(self.db.mark_event_deleted, event_id)
+                elif isinstance(result, discord.HTTPException):
+                    logger.warning(f"Could not check event {event_id}: {result}")
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    logger.debug("Event %s still exists on Discord", event_id)
 
-            # Check if we need to delete the old event
-            if self._should_delete_event(now, current_time_key):
-                await self._delete_old_event()
-                self._last_delete_check = current_time_key
+            logger.info("Completed stale event cleanup")
 
         except Exception as e:
-            logger.error(f"Error in event schedule check: {e}")
-
-    def _should_create_event(self, now: datetime, current_time_key: str) -> bool:
-        """Check if we should create an event now."""
-        return now.weekday() == self.create_day and now.hour == self.create_hour and self._last_create_check != current_time_key
-
-    def _should_delete_event(self, now: datetime, current_time_key: str) -> bool:
-        """Check if we should delete an event now."""
-        return now.weekday() == self.delete_day and now.hour == self.delete_hour and self._last_delete_check != current_time_key
+            logger.error(f"Error during stale event cleanup: {e}")
 
-    @check_event_schedule.before_loop
-    async def before_check_schedule(self):
-        """Wait until bot is ready before starting the loop."""
+    async def _schedule_loop(self):
+        """Sleep until the next create or delete window opens, then run it."""
         await self.bot.wait_until_ready()
-        # Update loop interval if configured
-        self.check_event_schedule.change_interval(minutes=self.check_interval)
-        logger.info(
-            f"Event schedule check started (interval: {
-                self.check_interval} minutes)"
-        )
+        logger.info("Event schedule started")
 
-    async def _create_weekly_event(self):
+        # Windows ending at or before these times have already been handled
+        create_after = delete_after = datetime.now(self.timezone)
+        while True:
+            try:
+                next_create = self._next_occurrence(create_after, self.create_day, self.create_hour)
+                next_delete = self._next_occurrence(delete_after, self.delete_day, self.delete_hour)
+                target = min(next_create, next_delete)
+
+                # Timestamps, because subtracting datetimes in one zone ignores DST changes in between
+                now = datetime.now(self.timezone)
+                delay = target.timestamp() - now.timestamp()
+                if delay > MAX_SCHEDULE_SLEEP:
+                    await asyncio.sleep(MAX_SCHEDULE_SLEEP)
+                    continue
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    now = target
+
+                if target == next_create:
+                    await self._create_weekly_event(now)
+                    create_after = next_create + timedelta(hours=1)
+                if target == next_delete:
+                    await self._delete_old_event()
+                    delete_after = next_delete + timedelta(hours=1)
+
+            except Exception as e:
+                logger.error(f"Error in event schedule: {e}")
+                await asyncio.sleep(60)
+
+    def _next_occurrence(self, after: datetime, day: int, hour: int) -> datetime:
+        """Start of the first hour-long window on weekday `day` at `hour`:00 that ends after `after`."""
+        event_date = after.date() + timedelta(days=(day - after.weekday()) % 7)
+        start = datetime.combine(event_date, time(hour), tzinfo=self.timezone)
+        if start + timedelta(hours=1) <= after:
+            start += timedelta(days=7)
+        return start
+
+    async def _create_weekly_event(self, now: datetime):
         """Create the weekly Sunday Op event."""
         try:
             # Check if there's already an active event this week
-            if self.db.has_active_event():
+            if await run_db(self.db.has_active_event):
                 logger.info("Active event already exists, skipping creation")
                 return
 
@@ -216,7 +228,7 @@ class EventHandler(commands.Cog):
                 return
 
             # Calculate next Sunday at specified time
-            event_datetime = self._calculate_next_sunday()
+            event_datetime = self._calculate_next_sunday(now)
             if not event_datetime:
                 logger.error("Could not calculate next Sunday for event")
                 return
@@ -237,25 +249,23 @@ class EventHandler(commands.Cog):
                 privacy_level=discord.PrivacyLevel.guild_only,
             )
 
-            # Store in database
-            self.db.store_event(event.id, event_datetime.date())
-
             logger.info(
                 f"Created weekly event: {event_title} (ID: {
                     event.id})"
             )
 
-            # Send notification
-            await self._send_event_notification(guild, event)
+            # Store in database and send the notification at the same time
+            await asyncio.gather(
+                run_db(self.db.store_event, event.id, event_datetime.date()),
+                self._send_event_notification(guild, event),
+            )
 
         except Exception as e:
             logger.error(f"Error creating weekly event: {e}")
 
-    def _calculate_next_sunday(self) -> Optional[datetime]:
-        """Calculate the next Sunday at the specified time."""
+    def _calculate_next_sunday(self, now: datetime) -> Optional[datetime]:
+        """Calculate the next Sunday after now at the specified time."""
         try:
-            now = datetime.now(self.timezone)
-
             # Calculate days until next Sunday
             days_until_sunday = (6 - now.weekday()) % 7
             if days_until_sunday == 0:  # If today is Sunday
@@ -273,10 +283,7 @@ class EventHandler(commands.Cog):
             # Create the event datetime
             event_date = now.date() + timedelta(days=days_until_sunday)
             event_time = time(hour=self.event_time_hour, minute=self.event_time_minute)
-            event_datetime = datetime.combine(event_date, event_time)
-            event_datetime = self.timezone.localize(event_datetime)
-
-            return event_datetime
+            return datetime.combine(event_date, event_time, tzinfo=self.timezone)
 
         except Exception as e:
             logger.error(f"Error calculating next Sunday: {e}")
@@ -326,7 +333,7 @@ class EventHandler(commands.Cog):
         """Delete the previous week's event and update database with participant info."""
         try:
             # Get the active event from database
-            active_event = self.db.get_active_event()
+            active_event = await run_db(self.db.get_active_event)
             if not active_event:
                 logger.info("No active event to delete")
                 return
@@ -341,42 +348,66 @@ class EventHandler(commands.Cog):
                 return
 
             try:
-                event = await guild.fetch_scheduled_event(event_id)
+                event = guild.get_scheduled_event(event_id) or await guild.fetch_scheduled_event(event_id)
 
-                # Get interested users before deleting
-                interested_users = []
+                # Get interested users before deleting; only their IDs are stored.
+                # Discord pages these 100 per request, the most the API allows.
+                interested_ids = []
                 try:
-                    async for user in event.users():
-                        interested_users.append({"id": user.id, "name": user.display_name})
+                    async for user in event.users(limit=None):
+                        interested_ids.append(user.id)
                 except Exception as e:
                     logger.warning(f"Error fetching event users: {e}")
 
-                # Update database with final participant info
-                self.db.update_event_participants(event_id, len(interested_users), [user["name"] for user in interested_users])
+                # Record the participants first, so they are kept even if the delete fails
+                await run_db(self.db.update_event_participants, event_id, len(interested_ids), interested_ids)
 
-                # Delete the Discord event
+                # Delete the Discord event, then mark it deleted once that has succeeded
                 await event.delete()
-
-                # Mark as deleted in database
-                self.db.mark_event_deleted(event_id)
+                await run_db(self.db.mark_event_deleted, event_id)
 
                 logger.info(
                     f"Deleted event {event_id} with {
-                        len(interested_users)} interested users"
+                        len(interested_ids)} interested users"
                 )
 
             except discord.NotFound:
                 logger.warning(f"Event {event_id} not found on Discord, marking as deleted in DB")
-                self.db.mark_event_deleted(event_id)
+                await run_db(self.db.mark_event_deleted, event_id)
             except discord.HTTPException as e:
                 logger.error(f"HTTP error deleting Discord event {event_id}: {e}")
                 # Still mark as deleted in database if it's a 404-like error
                 if e.status == 404:
-                    self.db.mark_event_deleted(event_id)
+                    await run_db(self.db.mark_event_deleted, event_id)
 
         except Exception as e:
             logger.error(f"Error in delete old event: {e}")
 
+    async def _is_tracked_event(self, event: discord.ScheduledEvent) -> bool:
+        """Check whether a scheduled event is the one this cog created and still tracks."""
+        if event.guild_id != self.guild_id:
+            return False
+        active_event = await run_db(self.db.get_active_event)
+        return bool(active_event) and active_event["event_id"] == event.id
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_user_add(self, event: discord.ScheduledEvent, user: discord.User):
+        """Record a new RSVP on the tracked event."""
+        try:
+            if await self._is_tracked_event(event):
+                await run_db(self.db.add_event_participant, event.id, user.id)
+        except Exception as e:
+            logger.error(f"Error recording participant {user.id} for event {event.id}: {e}")
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_user_remove(self, event: discord.ScheduledEvent, user: discord.User):
+        """Drop a withdrawn RSVP from the tracked event."""
+        try:
+            if await self._is_tracked_event(event):
+                await run_db(self.db.remove_event_participant, event.id, user.id)
+        except Exception as e:
+            logger.error(f"Error removing participant {user.id} from event {event.id}: {e}")
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Called when the cog is ready."""
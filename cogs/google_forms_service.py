@@ -1,16 +1,27 @@
 import os
 import asyncio
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Largest page the Forms API serves for responses.list
+RESPONSES_PAGE_SIZE = 5000
+# Partial response: only the response fields the bot reads
+RESPONSE_FIELDS = "nextPageToken,responses(responseId,createTime,answers)"
+
 
 class GoogleFormsService:
+    __slots__ = ("scopes", "credentials_file", "token_file", "service", "_forms", "_responses", "_credentials", "_executor", "_local", "_init_lock")
+
     def __init__(self):
         self.scopes = [
             "https://www.googleapis.com/auth/forms.responses.readonly",
@@ -20,7 +31,14 @@ class GoogleFormsService:
         self.token_file = os.getenv("GOOGLE_TOKEN_FILE")
 
         self.service = None
-        self._initialize_service()
+        self._credentials = None
+        # API calls run on these threads, each with its own kept-alive connection,
+        # because httplib2 connections must not be shared between threads
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gforms")
+        self._local = threading.local()
+        # The service is set up on first use, off the event loop: refreshing the
+        # token or running the consent flow blocks on the network
+        self._init_lock = asyncio.Lock()
 
     def _initialize_service(self):
         """Initialize the Google Forms service"""
@@ -36,40 +54,78 @@ class GoogleFormsService:
                     flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
                     creds = flow.run_local_server(port=0)
 
-                with open(self.token_file, "w") as token:
+                # Write beside the token and rename over it, so a crash never leaves it half written
+                tmp_file = f"{self.token_file}.tmp"
+                with open(tmp_file, "w") as token:
                     token.write(creds.to_json())
+                os.replace(tmp_file, self.token_file)
 
+            self._credentials = creds
             self.service = build("forms", "v1", credentials=creds)
+            # Resource objects are rebuilt on every call, so keep the ones used
+            self._forms = self.service.forms()
+            self._responses = self._forms.responses()
             logger.info("Google Forms service initialized successfully")
 
         except Exception as e:
             logger.error(f"Failed to initialize Google Forms service: {e}")
             raise
 
-    async def get_form_responses(self, form_id: str) -> List[Dict[str, Any]]:
+    def _execute(self, request):
+        """Execute an API request on this worker thread's own HTTP connection"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+        return request.execute(http=http)
+
+    async def _ensure_service(self):
+        """Initialize the service on the worker pool the first time it is needed"""
+        if self.service is None:
+            async with self._init_lock:
+                if self.service is None:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(self._executor, self._initialize_service)
+
+    async def _run(self, request):
+        """Execute an API request on the service's thread pool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._execute, request)
+
+    def close(self):
+        """Stop the API worker threads"""
+        self._executor.shutdown(wait=False)
+
+    async def get_form_responses(self, form_id: str, submitted_since: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all responses for a given form
+        Get all responses for a given form, following every page
 
         Args:
             form_id: The Google Form ID
+            submitted_since: Optional RFC3339 UTC timestamp; only responses submitted at or after it are returned
 
         Returns:
             List of response dictionaries
+
+        Raises:
+            Exception: If the API request fails, so callers can tell a failure from an empty form
         """
         try:
-
-            def _get_responses():
-                return self.service.forms().responses().list(formId=form_id).execute()
-
-            # Run in executor to avoid blocking the event loop
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, _get_responses)
-
-            return result.get("responses", [])
+            await self._ensure_service()
+            responses = []
+            params = {"formId": form_id, "pageSize": RESPONSES_PAGE_SIZE, "fields": RESPONSE_FIELDS}
+            if submitted_since:
+                params["filter"] = f"timestamp >= {submitted_since}"
+            request = self._responses.list(**params)
+            while request is not None:
+                result = await self._run(request)
+                responses.extend(result.get("responses", []))
+                request = self._responses.list_next(request, result)
+
+            return responses
 
         except Exception as e:
             logger.error(f"Error fetching form responses: {e}")
-            return []
+            raise
 
     async def get_form_info(self, form_id: str) -> Dict[str, Any]:
         """
@@ -80,20 +136,17 @@ class GoogleFormsService:
 
         Returns:
             Form information dictionary
+
+        Raises:
+            Exception: If the API request fails
         """
         try:
-
-            def _get_form_info():
-                return self.service.forms().get(formId=form_id).execute()
-
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, _get_form_info)
-
-            return result
+            await self._ensure_service()
+            return await self._run(self._forms.get(formId=form_id))
 
         except Exception as e:
             logger.error(f"Error fetching form info: {e}")
-            return {}
+            raise
 
     def build_question_map(self, form_info: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -105,21 +158,14 @@ class GoogleFormsService:
         Returns:
             Dictionary mapping question IDs to titles
         """
-        question_map = {}
-
         try:
-            items = form_info.get("items", [])
-            for item in items:
-                # Handle different item types
-                if "questionItem" in item:
-                    question = item["questionItem"]["question"]
-                    question_id = question.get("questionId")
-                    title = item.get("title", f"Question {question_id}")
-
-                    if question_id:
-                        question_map[question_id] = title
+            # Only question items carry a question ID; the fallback title is built only when needed
+            return {
+                question_id: item.get("title") or f"Question {question_id}"
+                for item in form_info.get("items", ())
+                if "questionItem" in item and (question_id := item["questionItem"]["question"].get("questionId"))
+            }
 
         except Exception as e:
             logger.error(f"Error building question map: {e}")
-
-        return question_map
+            return {}
@@ -1,11 +1,15 @@
+import asyncio
 import discord
 from discord.ext import commands
 from datetime import datetime
+import io
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+UNIT_ICON_PATH = "assets/icons/HAVOC_UNITPATCH_400_GREY.png"
+
 
 class WelcomeButtons(discord.ui.View):
     """Persistent view for welcome message buttons."""
@@ -16,45 +20,12 @@ class WelcomeButtons(discord.ui.View):
 
     @discord.ui.button(label="How to Apply", style=discord.ButtonStyle.primary, custom_id="how_to_apply")
     async def how_to_apply_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        embed = discord.Embed(
-            title="How to Apply",
-            color=discord.Color.blue(),
-            description=(
-                f"1. Use the `/apply` command for the link to the application form\n"
-                f"2. Complete the Google Form **(don't change the pre-filled Discord ID textbox!)**\n"
-                f"3. We will review and process your application shortly\n"
-                f"4. You'll be notified of the decision via DM or in this channel\n\n"
-            )
-        )
-        file = discord.File("assets/icons/HAVOC_UNITPATCH_400_GREY.png", filename="unit_icon.png")
-        embed.set_thumbnail(url="attachment://unit_icon.png")
-        embed.set_footer(text="Please ping an admin if you have any questions!")
-        await interaction.response.send_message(file=file, embed=embed, ephemeral=True)
+        await interaction.response.send_message(file=self.cog.unit_icon_file(), embed=self.cog.apply_embed, ephemeral=True)
         logger.info(f"User {interaction.user.display_name} requested application info")
 
     @discord.ui.button(label="Server Info", style=discord.ButtonStyle.primary, custom_id="server_info")
     async def server_info_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        embed = discord.Embed(
-            title="Discord Server Info",
-            color=discord.Color.blue(),
-            description=(
-                f"* Our community rules can be found in <#{self.cog.rules_channel_id}>\n"
-                f"* Community announcements are posted in <#{self.cog.announcements_channel_id}>\n"
-                f"* Gameplay information specific to the way we run operations can be found in <#{self.cog.gameplay_info_channel_id}>\n"
-                f"* Mission briefings are posted as forum threads in <#{self.cog.a3_briefings_channel_id}>\n"
-                f"* Screenshots and videos from prior missions are posted in <#{self.cog.aar_channel_id}>\n"
-                f"* Our modpack can be found in <#{self.cog.mods_channel_id}>\n\n"
-            ),
-        )
-        embed.add_field(
-            name="",
-            value=f"These channels are open to viewing from the public as a means to provide context and an idea of how our community runs.\n\n"
-                  f"More channels, and the ability to post in these channels, are unlocked upon an application being accepted."
-        )
-        file = discord.File("assets/icons/HAVOC_UNITPATCH_400_GREY.png", filename="unit_icon.png")
-        embed.set_thumbnail(url="attachment://unit_icon.png")
-        embed.set_footer(text="Please ping an admin if you have any questions!")
-        await interaction.response.send_message(file=file, embed=embed, ephemeral=True)
+        await interaction.response.send_message(file=self.cog.unit_icon_file(), embed=self.cog.server_info_embed, ephemeral=True)
         logger.info(f"User {interaction.user.display_name} requested group info")
 
 
@@ -65,6 +36,47 @@ class MemberEvents(commands.Cog):
         self.bot = bot
         self._load_config()
 
+        # Button replies never change, so build them once; the icon is read on first use
+        self._unit_icon_bytes = None
+        self.apply_embed = self._build_apply_embed()
+        self.server_info_embed = self._build_server_info_embed()
+
+        # One persistent view serves every welcome message; buttons are matched by custom_id
+        self.welcome_view = WelcomeButtons(self)
+
+        # Resolved from the guild cache once it is available
+        self.applicant_role = None
+        self.admin_role = None
+        self.join_leave_channel = None
+        self.applicant_channel = None
+
+    async def cog_load(self):
+        """Register the welcome buttons so messages sent before a restart keep working."""
+        self.bot.add_view(self.welcome_view)
+        if self.bot.is_ready():
+            self._resolve_guild_objects(self.bot.get_guild(self.guild_id))
+
+    def _resolve_guild_objects(self, guild):
+        """Cache the roles and channels used by the join/leave listeners."""
+        if guild is None:
+            logger.warning(f"Could not find guild with ID {self.guild_id}")
+            return
+        self.applicant_role = guild.get_role(self.applicant_role_id)
+        self.admin_role = guild.get_role(self.admin_role_id)
+        self.join_leave_channel = guild.get_channel(self.join_leave_channel_id)
+        self.applicant_channel = guild.get_channel(self.applicant_channel_id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Resolve guild objects once the cache is populated."""
+        self._resolve_guild_objects(self.bot.get_guild(self.guild_id))
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        """Re-resolve guild objects when the guild is (re)loaded, e.g. after an outage."""
+        if guild.id == self.guild_id:
+            self._resolve_guild_objects(guild)
+
     def _load_config(self):
         """Load configuration from environment variables."""
         try:
@@ -83,6 +95,52 @@ class MemberEvents(commands.Cog):
             logger.error(f"Invalid configuration values: {e}")
             raise
 
+    def _build_apply_embed(self) -> discord.Embed:
+        """Build the reply to the How to Apply button."""
+        embed = discord.Embed(
+            title="How to Apply",
+            color=discord.Color.blue(),
+            description=(
+                f"1. Use the `/apply` command for the link to the application form\n"
+                f"2. Complete the Google Form **(don't change the pre-filled Discord ID textbox!)**\n"
+                f"3. We will review and process your application shortly\n"
+                f"4. You'll be notified of the decision via DM or in this channel\n\n"
+            )
+        )
+        embed.set_thumbnail(url="attachment://unit_icon.png")
+        embed.set_footer(text="Please ping an admin if you have any questions!")
+        return embed
+
+    def _build_server_info_embed(self) -> discord.Embed:
+        """Build the reply to the Server Info button."""
+        embed = discord.Embed(
+            title="Discord Server Info",
+            color=discord.Color.blue(),
+            description=(
+                f"* Our community rules can be found in <#{self.rules_channel_id}>\n"
+                f"* Community announcements are posted in <#{self.announcements_channel_id}>\n"
+                f"* Gameplay information specific to the way we run operations can be found in <#{self.gameplay_info_channel_id}>\n"
+                f"* Mission briefings are posted as forum threads in <#{self.a3_briefings_channel_id}>\n"
+                f"* Screenshots and videos from prior missions are posted in <#{self.aar_channel_id}>\n"
+                f"* Our modpack can be found in <#{self.mods_channel_id}>\n\n"
+            ),
+        )
+        embed.add_field(
+            name="",
+            value=f"These channels are open to viewing from the public as a means to provide context and an idea of how our community runs.\n\n"
+                  f"More channels, and the ability to post in these channels, are unlocked upon an application being accepted."
+        )
+        embed.set_thumbnail(url="attachment://unit_icon.png")
+        embed.set_footer(text="Please ping an admin if you have any questions!")
+        return embed
+
+    def unit_icon_file(self) -> discord.File:
+        """Return a fresh attachment of the unit icon, reading the image from disk only once."""
+        if self._unit_icon_bytes is None:
+            with open(UNIT_ICON_PATH, "rb") as f:
+                self._unit_icon_bytes = f.read()
+        return discord.File(io.BytesIO(self._unit_icon_bytes), filename="unit_icon.png")
+
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """Automatically assign applicant role when a member joins and notifies admins"""
@@ -90,46 +148,61 @@ class MemberEvents(commands.Cog):
         if member.guild.id != self.guild_id:
             return
 
-        guild = self.bot.get_guild(self.guild_id)
+        # (what it does, what was done, coroutine); the Discord calls are independent, so run them together
+        actions = []
         try:
             # Assign applicant role
-            role = member.guild.get_role(self.applicant_role_id)
-
+            role = self.applicant_role
             if not role:
                 logger.error(f"Could not find applicant role with ID {self.applicant_role_id}")
             else:
-                await member.add_roles(role, reason="Auto-assigned applicant role on join")
-                logger.info(f"Assigned applicant role to {member.display_name} ({member.id})")
+                actions.append((
+                    f"assign applicant role to {member.display_name}",
+                    f"Assigned applicant role to {member.display_name} ({member.id})",
+                    member.add_roles(role, reason="Auto-assigned applicant role on join"),
+                ))
 
             # Send notification to join/leave channel
-            join_leave_channel = guild.get_channel(self.join_leave_channel_id)
+            join_leave_channel = self.join_leave_channel
             if join_leave_channel:
-                admin_role = guild.get_role(self.admin_role_id)
+                admin_role = self.admin_role
                 if admin_role:
                     welcome_notification = f"{admin_role.mention}, {member.mention} has joined! Go say hi!"
-                    await join_leave_channel.send(welcome_notification)
-                    logger.info(f"Sent join notification for {member.display_name}")
+                    actions.append((
+                        f"send join notification for {member.display_name}",
+                        f"Sent join notification for {member.display_name}",
+                        join_leave_channel.send(welcome_notification),
+                    ))
                 else:
                     logger.warning(f"Could not find admin role with ID {self.admin_role_id}")
             else:
                 logger.warning(f"Could not find join/leave channel with ID {self.join_leave_channel_id}")
 
             # Send welcome message with buttons in applicant channel
-            applicant_channel = guild.get_channel(self.applicant_channel_id)
+            applicant_channel = self.applicant_channel
             if applicant_channel:
                 welcome_message = f"Welcome, {member.mention}!"
-                view = WelcomeButtons(self)  # Pass the cog instance
-                await applicant_channel.send(welcome_message, view=view)
-                logger.info(f"Sent welcome message with buttons for {member.display_name}")
+                actions.append((
+                    f"send welcome message for {member.display_name}",
+                    f"Sent welcome message with buttons for {member.display_name}",
+                    applicant_channel.send(welcome_message, view=self.welcome_view),
+                ))
             else:
                 logger.warning(f"Could not find applicant channel with ID {self.applicant_channel_id}")
 
-        except discord.Forbidden:
-            logger.error(f"Missing permissions to assign role to {member.display_name}")
-        except discord.HTTPException as e:
-            logger.error(f"Failed to assign applicant role to {member.display_name}: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error assigning applicant role to {member.display_name}: {e}")
+            logger.error(f"Unexpected error handling join of {member.display_name}: {e}")
+
+        results = await asyncio.gather(*(coro for _, _, coro in actions), return_exceptions=True)
+        for (action, done, _), result in zip(actions, results):
+            if isinstance(result, discord.Forbidden):
+                logger.error(f"Missing permissions to {action}")
+            elif isinstance(result, discord.HTTPException):
+                logger.error(f"Failed to {action}: {result}")
+            elif isinstance(result, BaseException):
+                logger.error(f"Unexpected error trying to {action}: {result}")
+            else:
+                logger.info(done)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
@@ -138,12 +211,11 @@ class MemberEvents(commands.Cog):
         if member.guild.id != self.guild_id:
             return
 
-        guild = self.bot.get_guild(self.guild_id)
         logger.info(f"Member left: {member.display_name} ({member.id})")
 
         # Send leave notification to channel
         try:
-            join_leave_channel = guild.get_channel(self.join_leave_channel_id)
+            join_leave_channel = self.join_leave_channel
             if join_leave_channel:
                 now = datetime.now()
                 unix_ts = int(now.timestamp())
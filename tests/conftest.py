@@ -3,7 +3,6 @@ import pytest
 import sys
 import os
 import tempfile
-from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -21,7 +20,7 @@ def temp_database():
         pass
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def mock_env_vars():
     test_env = {
         "DISCORD_TOKEN": "test_token",
@@ -43,5 +42,9 @@ def mock_env_vars():
         "EVENT_DELETE_HOUR": "0",  # Midnight
     }
 
-    with patch.dict("os.environ", test_env):
-        yield
+    # Set once for the whole session; tests that need other values patch on top
+    mp = pytest.MonkeyPatch()
+    for key, value in test_env.items():
+        mp.setenv(key, value)
+    yield
+    mp.undo()
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import MagicMock, AsyncMock, patch
 import time
+from collections import deque
 from cogs.application_handler import ApplicationHandler
+from cogs.google_forms_service import GoogleFormsService
 
 
 class TestApplicationHandler(unittest.TestCase):
@@ -24,36 +26,29 @@ class TestApplicationHandler(unittest.TestCase):
             "APPLICATION_POLL_INTERVAL": "30",
         }
 
-        # Patch everything needed to prevent async task creation
-        with (
-            patch("cogs.application_handler.Database") as mock_db,
-            patch("cogs.application_handler.GoogleFormsService") as mock_google,
-            patch.dict("os.environ", env_vars),
-            patch("cogs.application_handler.tasks"),
-        ):  # Prevent task creation
-
-            self.mock_db = mock_db.return_value
-            self.mock_google = mock_google.return_value
-
-            # Create handler without starting tasks
-            self.handler = ApplicationHandler.__new__(ApplicationHandler)
-            self.handler.bot = self.mock_bot
-            self.handler.db = self.mock_db
-            self.handler.google_service = self.mock_google
-            self.handler._vote_lock = unittest.mock.MagicMock()
-            self.handler._api_call_times = []
-            self.handler._max_calls_per_minute = 30
-            self.handler._rate_limit_window = 60
-            self.handler._recent_responses = {}
-            self.handler._response_cache_ttl = 300
-            self.handler.question_map = {}
-            self.handler._processing_applications = set()
-
-            # Initialize the new rate limiting attributes
-            self.handler._last_rate_limit_time = 0
-            self.handler._rate_limit_backoff = 60
-
-            # Load config manually
+        # Built via __new__, so no Database, Forms client or tasks are created;
+        # only _load_config needs the patched environment
+        self.mock_db = MagicMock()
+        self.mock_google = MagicMock()
+
+        self.handler = ApplicationHandler.__new__(ApplicationHandler)
+        self.handler.bot = self.mock_bot
+        self.handler.db = self.mock_db
+        self.handler.google_service = self.mock_google
+        self.handler._vote_lock = unittest.mock.MagicMock()
+        self.handler._api_call_times = deque(maxlen=30)
+        self.handler._max_calls_per_minute = 30
+        self.handler._rate_limit_window = 60
+        self.handler._recent_responses = {}
+        self.handler._response_cache_ttl = 300
+        self.handler.question_map = {}
+        self.handler._processing_applications = set()
+
+        # Initialize the new rate limiting attributes
+        self.handler._last_rate_limit_time = float("-inf")
+        self.handler._rate_limit_backoff = 60
+
+        with patch.dict("os.environ", env_vars):
             self.handler._load_config()
 
     def test_config_loading(self):
@@ -133,11 +128,76 @@ class TestApplicationHandler(unittest.TestCase):
         self.assertFalse(self.handler._is_decisive_vote(vote_counts, "approve"))
         self.assertFalse(self.handler._is_decisive_vote(vote_counts, "deny"))
 
+    def test_advance_responses_since(self):
+        """Test the poll window trails the newest response by the safety margin"""
+        self.handler._responses_since = None
+        self.handler._advance_responses_since([{"responseId": "r1"}])
+        self.assertIsNone(self.handler._responses_since)
+
+        responses = [
+            {"responseId": "r1", "createTime": "2024-05-01T12:00:00.123Z"},
+            {"responseId": "r2", "createTime": "2024-05-01T12:30:00Z"},
+        ]
+        self.handler._advance_responses_since(responses)
+        self.assertEqual(self.handler._responses_since, "2024-05-01T12:20:00Z")
+
+    def test_apply_vote_returns_new_counts(self):
+        """Test _apply_vote derives the post-vote counts from a single state read"""
+        cases = [
+            (None, "approve", {"approve": 2, "deny": 1}),  # new vote
+            ("deny", "approve", {"approve": 2, "deny": 0}),  # changed vote
+            ("approve", "approve", {"approve": 0, "deny": 1}),  # toggled off
+        ]
+        for current, vote_type, expected in cases:
+            with self.subTest(current=current, vote_type=vote_type):
+                self.mock_db.reset_mock()
+                self.mock_db.get_vote_state.return_value = {"approve": 1, "deny": 1, "my_vote": current}
+
+                self.assertEqual(self.handler._apply_vote("r", 1, vote_type), expected)
+                self.mock_db.get_vote_counts.assert_not_called()
+
+    def test_posted_response_is_stored_and_marked_together(self):
+        """Test a posted application is recorded through the single store-and-mark write"""
+        import asyncio
+
+        message = MagicMock(id=4242)
+        channel = MagicMock(id=77)
+        channel.send = AsyncMock(return_value=message)
+        self.mock_bot.get_guild.return_value.get_channel.return_value = channel
+        self.mock_db.store_posted_application.return_value = {"response_id": "r1"}
+        self.handler._app_message_ids = set()
+        self.handler._create_application_embed = AsyncMock()
+        self.handler._send_application_confirmation = AsyncMock()
+
+        self.assertTrue(asyncio.run(self.handler._process_new_response({"responseId": "r1"})))
+        self.mock_db.store_posted_application.assert_called_once_with("r1", 4242, 77)
+        self.mock_db.store_application_message.assert_not_called()
+        self.assertIn(4242, self.handler._app_message_ids)
+
+        # Nothing was recorded if the store fails, so the poll has to mark it
+        self.mock_db.store_posted_application.return_value = None
+        self.assertFalse(asyncio.run(self.handler._process_new_response({"responseId": "r2"})))
+
+    def test_poll_batch_marks_only_unrecorded_responses(self):
+        """Test only responses that were not stored with their mark are batch-marked after a poll"""
+        import asyncio
+
+        self.handler.question_map = {"q": "Question"}
+        self.handler._responses_since = None
+        self.mock_google.get_form_responses = AsyncMock(return_value=[{"responseId": "posted"}, {"responseId": "failed"}])
+        self.mock_db.is_response_processed.return_value = False
+        self.handler._prefetch_members = AsyncMock()
+        self.handler._process_new_response = AsyncMock(side_effect=[True, False])
+
+        asyncio.run(self.handler._poll_responses())
+
+        self.mock_db.batch_mark_responses_processed.assert_called_once_with(["failed"])
+
     def test_rate_limiting(self):
         """Test rate limiting functionality with improved logic"""
         # Reset state for clean test
-        self.handler._api_call_times = []
-        self.handler._last_rate_limit_time = 0
+        self.handler._api_call_times = deque(maxlen=30)
+        self.handler._last_rate_limit_time = float("-inf")
 
         # Initially should not be rate limited
         self.assertFalse(self.handler._is_rate_limited())
@@ -156,15 +216,15 @@ class TestApplicationHandler(unittest.TestCase):
         self.assertTrue(self.handler._is_rate_limited())
 
         # Should remain rate limited due to backoff even if we clear calls
-        self.handler._api_call_times = []
+        self.handler._api_call_times = deque(maxlen=30)
         self.assertTrue(self.handler._is_rate_limited())  # Still in backoff period
 
     def test_rate_limiting_window_expiry(self):
         """Test that rate limiting expires after the window period"""
         # Simulate calls from more than 60 seconds ago
-        old_time = time.time() - 70  # 70 seconds ago
-        self.handler._api_call_times = [old_time] * self.handler._max_calls_per_minute
-        self.handler._last_rate_limit_time = 0
+        old_time = time.monotonic() - 70  # 70 seconds ago
+        self.handler._api_call_times = deque([old_time] * self.handler._max_calls_per_minute, maxlen=30)
+        self.handler._last_rate_limit_time = float("-inf")
 
         # Should not be rate limited since calls are outside the window
         self.assertFalse(self.handler._is_rate_limited())
@@ -172,25 +232,25 @@ class TestApplicationHandler(unittest.TestCase):
     def test_rate_limiting_backoff_period(self):
         """Test that backoff period is respected"""
         # Set up a recent rate limit hit
-        self.handler._last_rate_limit_time = time.time() - 30  # 30 seconds ago
-        self.handler._api_call_times = []  # No current calls
+        self.handler._last_rate_limit_time = time.monotonic() - 30  # 30 seconds ago
+        self.handler._api_call_times = deque(maxlen=30)  # No current calls
 
         # Should still be rate limited due to backoff
         self.assertTrue(self.handler._is_rate_limited())
 
         # Simulate backoff period expiring
-        self.handler._last_rate_limit_time = time.time() - 70  # 70 seconds ago
+        self.handler._last_rate_limit_time = time.monotonic() - 70  # 70 seconds ago
 
         # Should no longer be rate limited
         self.assertFalse(self.handler._is_rate_limited())
 
-    @patch("time.time")
+    @patch("time.monotonic")
     def test_api_call_recording(self, mock_time):
         """Test API call timestamp recording"""
         mock_time.return_value = 1000.0
 
         # Reset state
-        self.handler._api_call_times = []
+        self.handler._api_call_times = deque(maxlen=30)
 
         # Record a call
         self.handler._record_api_call()
@@ -201,14 +261,14 @@ class TestApplicationHandler(unittest.TestCase):
 
     def test_rate_limit_cleanup(self):
         """Test that old API call timestamps are cleaned up"""
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Add some old calls and some recent calls
         old_calls = [current_time - 70, current_time - 80, current_time - 90]  # > 60 seconds old
         recent_calls = [current_time - 10, current_time - 20, current_time - 30]  # < 60 seconds old
 
-        self.handler._api_call_times = old_calls + recent_calls
-        self.handler._last_rate_limit_time = 0
+        self.handler._api_call_times = deque(old_calls + recent_calls, maxlen=30)
+        self.handler._last_rate_limit_time = float("-inf")
 
         # Check rate limit (this should clean up old calls)
         self.handler._is_rate_limited()
@@ -217,3 +277,99 @@ class TestApplicationHandler(unittest.TestCase):
         self.assertEqual(len(self.handler._api_call_times), 3)
         for call_time in self.handler._api_call_times:
             self.assertGreater(call_time, current_time - 60)
+
+    def test_application_embed_fields(self):
+        """Test form answers are rendered as sanitized embed fields in form order"""
+        import asyncio
+
+        self.handler.discord_id_question = "q_discord"
+        self.handler.question_map = {"q_discord": "Discord ID", "q_name": "Name", "q_games": "Games", "q_missing": "Skipped"}
+        self.handler._get_discord_member = AsyncMock(return_value=None)
+
+        response = {
+            "responseId": "resp1",
+            "createTime": "2024-01-01T00:00:00Z",
+            "answers": {
+                "q_games": {"textAnswers": {"answers": [{"value": "Arma"}, {"value": "@everyone"}]}},
+                "q_name": {"textAnswers": {"answers": [{"value": "Alice"}]}},
+                "q_discord": {"textAnswers": {"answers": [{"value": "123456789012345678"}]}},
+            },
+        }
+
+        embed = asyncio.run(self.handler._create_application_embed(response, MagicMock()))
+
+        fields = [(field.name, field.value) for field in embed.fields]
+        self.assertEqual(fields[0], ("Name", "Alice"))
+        self.assertEqual(fields[1], ("Games", "Arma, @\u200beveryone"))
+        self.assertEqual(fields[2][0], "Votes")
+        self.assertIn("123456789012345678", embed.title)
+
+    def test_poll_skipped_while_in_progress(self):
+        """Test a scheduled poll does not overlap one that is already running"""
+        import asyncio
+
+        async def run():
+            self.handler._poll_lock = asyncio.Lock()
+            self.handler._poll_responses = AsyncMock()
+            async with self.handler._poll_lock:
+                await self.handler.check_new_responses()
+            self.handler._poll_responses.assert_not_called()
+
+            await self.handler.check_new_responses()
+            self.handler._poll_responses.assert_awaited_once()
+
+        asyncio.run(run())
+
+    def test_api_call_slot_records_only_on_success(self):
+        """Test the rate limit only consumes a slot for calls that succeed"""
+        self.handler._api_call_times = deque(maxlen=30)
+
+        with self.handler._api_call_slot():
+            pass
+        self.assertEqual(len(self.handler._api_call_times), 1)
+
+        with self.assertRaises(RuntimeError):
+            with self.handler._api_call_slot():
+                raise RuntimeError("API request failed")
+        self.assertEqual(len(self.handler._api_call_times), 1)
+
+    def test_failed_form_calls_do_not_use_rate_limit_slots(self):
+        """Test failed Forms API calls leave the rate limit untouched"""
+        import asyncio
+
+        self.handler._api_call_times = deque(maxlen=30)
+        self.handler.question_map = {"q": "Question"}
+        self.handler._responses_since = None
+        # A real service, so its own error handling is exercised; only the request execution fails
+        service = self.handler.google_service = GoogleFormsService.__new__(GoogleFormsService)
+        service.service, service._forms, service._responses = MagicMock(), MagicMock(), MagicMock()
+
+        with patch.object(GoogleFormsService, "_run", side_effect=Exception("API request failed")):
+            asyncio.run(self.handler._poll_responses())
+            self.assertEqual(asyncio.run(self.handler._get_member_and_role(MagicMock(), "r1")), (None, None))
+            self.handler.question_map = {}
+            asyncio.run(self.handler._build_question_map())
+
+        self.assertEqual(len(self.handler._api_call_times), 0)
+        self.mock_db.batch_mark_responses_processed.assert_not_called()
+
+    def test_prefetch_members_queries_only_uncached(self):
+        """Test applicants are resolved in one gateway query, skipping cached members"""
+        import asyncio
+
+        self.handler.discord_id_question = "entry.123456"
+        cached_id, missing_id = 123456789012345678, 234567890123456789
+
+        guild = MagicMock()
+        guild.get_member.side_effect = lambda member_id: MagicMock() if member_id == cached_id else None
+        guild.query_members = AsyncMock(return_value=[])
+        self.mock_bot.get_guild.return_value = guild
+
+        responses = [
+            {"answers": {"entry.123456": {"textAnswers": {"answers": [{"value": str(cached_id)}]}}}},
+            {"answers": {"entry.123456": {"textAnswers": {"answers": [{"value": str(missing_id)}]}}}},
+        ]
+
+        asyncio.run(self.handler._prefetch_members(responses))
+
+        guild.query_members.assert_awaited_once_with(user_ids=[missing_id], limit=1, cache=True)
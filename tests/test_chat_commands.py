@@ -1,13 +1,20 @@
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from cogs.chat_commands import ChatCommands
 
 
+def _make_member(admin=False, role_ids=()):
+    """Minimal stand-in for the discord.Member attributes _is_admin reads"""
+    return SimpleNamespace(guild_permissions=SimpleNamespace(administrator=admin), roles=[SimpleNamespace(id=role_id) for role_id in role_ids])
+
+
 class TestChatCommands(unittest.TestCase):
 
-    def setUp(self):
-        """Set up test chat commands"""
-        self.mock_bot = MagicMock()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test chat commands once; no test mutates them"""
+        cls.mock_bot = MagicMock()
 
         env_vars = {
             "GOOGLE_FORM_ID": "test_form_id",
@@ -17,7 +24,7 @@ class TestChatCommands(unittest.TestCase):
         }
 
         with patch.dict("os.environ", env_vars):
-            self.commands = ChatCommands(self.mock_bot)
+            cls.commands = ChatCommands(cls.mock_bot)
 
     def test_config_loading(self):
         """Test configuration loading"""
@@ -28,29 +35,12 @@ class TestChatCommands(unittest.TestCase):
 
     def test_is_admin_with_admin_permissions(self):
         """Test admin check with administrator permissions"""
-        mock_member = MagicMock()
-        mock_member.guild_permissions.administrator = True
-
-        result = self.commands._is_admin(mock_member)
-        self.assertTrue(result)
+        self.assertTrue(self.commands._is_admin(_make_member(admin=True)))
 
     def test_is_admin_with_admin_role(self):
         """Test admin check with admin role"""
-        mock_member = MagicMock()
-        mock_member.guild_permissions.administrator = False
-
-        mock_role = MagicMock()
-        mock_role.id = 999999999
-        mock_member.roles = [mock_role]
-
-        result = self.commands._is_admin(mock_member)
-        self.assertTrue(result)
+        self.assertTrue(self.commands._is_admin(_make_member(role_ids=(999999999,))))
 
     def test_is_admin_without_permissions(self):
         """Test admin check without permissions"""
-        mock_member = MagicMock()
-        mock_member.guild_permissions.administrator = False
-        mock_member.roles = []
-
-        result = self.commands._is_admin(mock_member)
-        self.assertFalse(result)
+        self.assertFalse(self.commands._is_admin(_make_member()))
@@ -1,27 +1,35 @@
 import unittest
 import tempfile
 import os
-import sqlite3
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
-from cogs.database import Database
+from cogs.database import SCHEMA_VERSION, ApplicationStatus, Database, sqlite3  # the driver module the Database uses
+
+# RAM-backed where available, so schema creation and checkpoints never wait on a disk sync
+TEST_DB_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _temp_db_path():
+    """Create an empty database file and return its path"""
+    fd, path = tempfile.mkstemp(suffix=".db", dir=TEST_DB_DIR)
+    os.close(fd)
+    return path
 
 
 class TestDatabase(unittest.TestCase):
     def setUp(self):
         """Set up test database with temporary file"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db = Database(self.temp_db.name)
+        self.db_path = _temp_db_path()
+        self.db = Database(self.db_path)
 
     def tearDown(self):
         """Clean up test database"""
         self.db.close()
-        os.unlink(self.temp_db.name)
+        os.unlink(self.db_path)
 
     def test_database_initialization(self):
         """Test database tables are created properly"""
-        conn = sqlite3.connect(self.temp_db.name)
+        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         # Check if tables exist
@@ -34,6 +42,19 @@ class TestDatabase(unittest.TestCase):
 
         conn.close()
 
+    def test_connection_pragmas(self):
+        """Test WAL journaling and per-connection tuning are applied"""
+        conn = self.db._get_connection()
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -32000)
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+            self.assertEqual(conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0], 2000)
+        finally:
+            conn.close()
+
     def test_response_processing_tracking(self):
         """Test response processing tracking functionality"""
         response_id = "test_response_123"
@@ -67,12 +88,21 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(app_data["message_id"], message_id)
         self.assertEqual(app_data["channel_id"], channel_id)
         self.assertEqual(app_data["status"], "pending")
+        self.assertEqual(set(app_data), {"response_id", "message_id", "channel_id", "status"})
 
         # Test status update
         self.db.set_application_status(response_id, "accepted")
         updated_data = self.db.get_application_status(response_id)
         self.assertEqual(updated_data["status"], "accepted")
 
+    def test_pending_applications(self):
+        """Test only undecided applications are reported as open"""
+        self.db.store_application_message("open_app", 111, 999)
+        self.db.store_application_message("closed_app", 222, 999)
+        self.db.set_application_status("closed_app", "accepted")
+
+        self.assertEqual(self.db.get_pending_applications(), [("open_app", 111)])
+
     def test_voting_system(self):
         """Test voting functionality"""
         response_id = "test_vote_789"
@@ -108,31 +138,366 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(counts.get("approve", 0), 0)
         self.assertEqual(counts["deny"], 1)
 
+    def test_set_vote_upsert(self):
+        """Test set_vote inserts a new vote and replaces an existing one"""
+        response_id = "test_upsert"
+        user_id = 333333333
+        self.db.initialize_votes_table()
+
+        self.db.set_vote(response_id, user_id, "approve")
+        self.assertEqual(self.db.get_user_vote(response_id, user_id), "approve")
+
+        self.db.set_vote(response_id, user_id, "deny")
+        self.assertEqual(self.db.get_user_vote(response_id, user_id), "deny")
+        self.assertEqual(self.db.get_vote_counts(response_id), {"deny": 1})
+
+        # record_vote goes through the same upsert
+        self.db.record_vote(response_id, user_id, "approve")
+        self.assertEqual(self.db.get_vote_counts(response_id), {"approve": 1})
+
+        # ...as does the batch variant, with the last vote per user winning
+        self.db.record_votes([(response_id, user_id, "deny"), (response_id, 1, "approve"), (response_id, 1, "deny")])
+        self.assertEqual(self.db.get_vote_counts(response_id), {"deny": 2})
+
+    def test_vote_state(self):
+        """Test get_vote_state reports counts and the user's own vote together"""
+        self.db.initialize_votes_table()
+        self.assertEqual(self.db.get_vote_state("state", 1), {"approve": 0, "deny": 0, "my_vote": None})
+
+        self.db.record_votes([("state", 1, "deny"), ("state", 2, "approve"), ("state", 3, "approve")])
+        self.assertEqual(self.db.get_vote_state("state", 1), {"approve": 2, "deny": 1, "my_vote": "deny"})
+        self.assertEqual(self.db.get_vote_state("state", 2)["my_vote"], "approve")
+        self.assertIsNone(self.db.get_vote_state("state", 4)["my_vote"])
+
+    def test_application_votes_migration(self):
+        """Test votes left in the legacy application_votes table are folded into votes"""
+        self.db._execute_with_retry("CREATE TABLE application_votes (response_id TEXT, user_id INTEGER, vote TEXT)")
+        self.db._execute_with_retry(
+            "INSERT INTO application_votes VALUES (?, ?, ?)",
+            [("legacy", 1, "approve"), ("legacy", 2, "deny"), ("legacy", 3, "abstain")],
+            many=True,
+        )
+
+        # The migration runs when a database from before schema versioning is opened
+        self.db._execute_with_retry("PRAGMA user_version = 0")
+        self.db.close()
+        self.db = Database(self.db_path)
+
+        self.assertEqual(self.db.get_vote_counts("legacy"), {"approve": 1, "deny": 1})
+        remaining = self.db._execute_with_retry("SELECT name FROM sqlite_master WHERE name = 'application_votes'", fetch_one=True)
+        self.assertIsNone(remaining)
+
+    def test_batch_writes(self):
+        """Test batch marking of processed responses and storing of applications"""
+        ids = [f"batch_{i}" for i in range(5)]
+        self.db.batch_mark_responses_processed(ids + ids[:2])
+        self.db.batch_mark_responses_processed([])
+        for response_id in ids:
+            self.assertTrue(self.db.is_response_processed(response_id))
+
+        self.db.batch_store_applications((f"batch_{i}", 1000 + i, 42) for i in range(3))
+        self.assertEqual(self.db.get_application_by_message_id(1002)["response_id"], "batch_2")
+        self.assertEqual(len(self.db.get_pending_applications()), 3)
+
+    def test_store_posted_application(self):
+        """Test a posted application's row and processed mark are written together or not at all"""
+        stored = self.db.store_posted_application("posted", 3030, 42)
+        self.assertEqual(stored["message_id"], 3030)
+        self.assertTrue(self.db.is_response_processed("posted"))
+        self.assertEqual(self.db.get_application_by_message_id(3030)["response_id"], "posted")
+
+        execute = self.db._execute_with_retry
+
+        def fail_mark(query, *args, **kwargs):
+            if "processed_responses" in query:
+                raise sqlite3.OperationalError("disk I/O error")
+            return execute(query, *args, **kwargs)
+
+        with patch.object(self.db, "_execute_with_retry", side_effect=fail_mark):
+            self.assertIsNone(self.db.store_posted_application("lost", 3031, 42))
+
+        self.assertFalse(self.db.is_response_processed("lost"))
+        self.assertIsNone(self.db.get_application_by_message_id(3031))
+        self.assertIsNone(self.db.get_application_status("lost"))
+
+    def test_transaction_commit_and_rollback(self):
+        """Test writes in a transaction commit together or not at all"""
+        self.db.initialize_votes_table()
+        self.db.store_application_message("tx_app", 555, 42)
+
+        with self.db.transaction():
+            self.db.set_vote("tx_app", 1, "approve")
+            self.db.set_application_status("tx_app", "accepted")
+        self.assertEqual(self.db.get_user_vote("tx_app", 1), "approve")
+        self.assertEqual(self.db.get_application_status("tx_app")["status"], "accepted")
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.set_vote("tx_app", 2, "deny")
+                raise RuntimeError("abort")
+        self.assertIsNone(self.db.get_user_vote("tx_app", 2))
+
+    def test_rolled_back_writes_leave_caches_untouched(self):
+        """Test cache updates from a transaction are applied only once it commits"""
+        self.db.store_application_message("moved", 600, 42)
+        self.assertEqual(self.db.get_application_by_message_id(600)["response_id"], "moved")
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.mark_response_processed("x")
+                self.db.batch_mark_responses_processed(["y"])
+                self.db.store_application_message("a", 5, 6)
+                self.db.store_application_message("moved", 601, 42)
+                # Reads inside the transaction see its writes but do not cache them
+                self.assertTrue(self.db.is_response_processed("x"))
+                self.assertEqual(self.db.get_application_by_message_id(5)["response_id"], "a")
+                self.assertIsNone(self.db.get_application_by_message_id(600))
+                raise RuntimeError("abort")
+
+        self.assertFalse(self.db.is_response_processed("x"))
+        self.assertFalse(self.db.is_response_processed("y"))
+        self.assertIsNone(self.db.get_application_by_message_id(5))
+        self.assertIsNone(self.db.get_application_by_message_id(601))
+        self.assertEqual(self.db.get_application_by_message_id(600)["response_id"], "moved")
+
+        # The same writes are cached once they commit
+        with self.db.transaction():
+            self.db.mark_response_processed("x")
+            self.db.store_application_message("a", 5, 6)
+        with patch.object(self.db, "_execute_with_retry") as execute:
+            self.assertTrue(self.db.is_response_processed("x"))
+            self.assertEqual(self.db.get_application_by_message_id(5)["response_id"], "a")
+            execute.assert_not_called()
+
+    def test_event_stats(self):
+        """Test event statistics aggregation"""
+        self.db.initialize_events_table()
+        self.assertEqual(self.db.get_event_stats(), {"total_events": 0, "active_events": 0, "completed_events": 0})
+        self.assertFalse(self.db.has_active_event())
+
+        for event_id in (1, 2, 3):
+            self.db.store_event(event_id, "2024-01-01")
+        self.assertTrue(self.db.has_active_event())
+        self.db.update_event_participants(1, 4, ["a", "b", "c", "d"])
+        self.db.update_event_participants(2, 2, ["a", "b"])
+        self.db.mark_event_deleted(1)
+        self.db.mark_event_deleted(2)
+
+        stats = self.db.get_event_stats()
+        self.assertEqual(stats["total_events"], 3)
+        self.assertEqual(stats["active_events"], 1)
+        self.assertEqual(stats["completed_events"], 2)
+        self.assertEqual(stats["avg_participants"], 3.0)
+
+    def test_connections_are_reused(self):
+        """Test reads use pooled read-only connections and no query opens a new connection once warm"""
+        self.db.mark_response_processed("pooled")
+        self.db.is_response_processed("not_cached")
+
+        with patch.object(self.db, "_get_connection", wraps=self.db._get_connection) as get_conn:
+            for i in range(5):
+                self.db.mark_response_processed(f"pooled_{i}")
+                self.assertFalse(self.db.is_response_processed(f"missing_{i}"))
+            self.assertEqual(get_conn.call_count, 0)
+
+        with self.db._reader() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO processed_responses (response_id) VALUES ('x')")
+
+    def test_in_memory_database(self):
+        """Test an in-memory database keeps its tables across calls"""
+        db = Database(":memory:")
+        db.mark_response_processed("memory")
+        self.assertTrue(db._execute_with_retry("SELECT 1 FROM processed_responses", fetch_one=True))
+        db.close()
+
+    def test_batch_is_atomic_in_autocommit(self):
+        """Test connections run in autocommit while a batch still commits as one unit"""
+        conn = self.db._get_connection()
+        self.assertIsNone(conn.isolation_level)
+        conn.close()
+
+        self.db.initialize_votes_table()
+        rows = [("atomic", 1, "approve"), ("atomic", 2, "maybe")]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db._execute_with_retry("INSERT INTO votes (response_id, user_id, vote_type) VALUES (?, ?, ?)", rows, many=True)
+        self.assertEqual(self.db.get_vote_counts("atomic"), {})
+
+    def test_writes_return_row(self):
+        """Test store and status writes return the row as written, with and without RETURNING"""
+        for has_returning in (True, False):
+            with self.subTest(has_returning=has_returning), patch("cogs.database.SQLITE_HAS_RETURNING", has_returning):
+                response_id = f"returning_{has_returning}"
+                stored = self.db.store_application_message(response_id, 900 + has_returning, 42)
+                self.assertEqual(stored["message_id"], 900 + has_returning)
+                self.assertEqual(stored["status"], "pending")
+
+                updated = self.db.set_application_status(response_id, "accept")
+                self.assertEqual(updated["status"], "accepted")
+                self.assertIsNone(self.db.set_application_status("missing", "accept"))
+
+    def test_lookup_caches(self):
+        """Test cached lookups skip the database and are invalidated by writes"""
+        self.db.mark_response_processed("cached_response")
+        self.db.store_application_message("cached_app", 777, 42)
+        self.assertEqual(self.db.get_application_by_message_id(777)["status"], "pending")
+
+        with patch.object(self.db, "_execute_with_retry", wraps=self.db._execute_with_retry) as execute:
+            self.assertTrue(self.db.is_response_processed("cached_response"))
+            self.assertEqual(self.db.get_application_by_message_id(777)["response_id"], "cached_app")
+            self.assertEqual(execute.call_count, 0)
+
+            self.db.set_application_status("cached_app", "accepted")
+            self.assertEqual(self.db.get_application_by_message_id(777)["status"], "accepted")
+
+        # A write only touches its own application's entries; other cached rows stay in memory
+        self.db.store_application_message("other_app", 888, 42)
+        self.assertEqual(self.db.get_application_by_message_id(888)["response_id"], "other_app")
+        self.db.set_application_status("cached_app", "rejected")
+        with patch.object(self.db, "_execute_with_retry", wraps=self.db._execute_with_retry) as execute:
+            self.assertEqual(self.db.get_application_by_message_id(888)["response_id"], "other_app")
+            self.assertEqual(execute.call_count, 0)
+
+        # Re-posting under a new message drops the entry for the old one
+        self.db.store_application_message("cached_app", 778, 42)
+        self.assertIsNone(self.db.get_application_by_message_id(777))
+        self.assertEqual(self.db.get_application_by_message_id(778)["response_id"], "cached_app")
+
+    def test_processed_cache_seeded_on_open(self):
+        """Test recently processed responses are answered from memory after reopening"""
+        self.db.batch_mark_responses_processed(["seed_1", "seed_2"])
+        self.db.close()
+        self.db = Database(self.db_path)
+
+        with patch.object(self.db, "_execute_with_retry") as execute:
+            self.assertTrue(self.db.is_response_processed("seed_1"))
+            self.assertTrue(self.db.is_response_processed("seed_2"))
+            execute.assert_not_called()
+
+    def test_current_schema_skips_ddl(self):
+        """Test reopening an up-to-date database runs no schema statements"""
+        self.assertEqual(self.db._execute_with_retry("PRAGMA user_version", fetch_one=True)[0], SCHEMA_VERSION)
+        self.db.close()
+
+        with patch.object(Database, "_create_schema") as create_schema:
+            self.db = Database(self.db_path)
+        create_schema.assert_not_called()
+
+    def test_event_participants(self):
+        """Test participants are stored per user and updated by delta"""
+        self.db.initialize_events_table()
+        self.db.store_event(10, "2024-01-01")
+
+        self.db.update_event_participants(10, 3, [111, 222, 333])
+        self.assertEqual(sorted(self.db.get_event_participants(10)), ["111", "222", "333"])
+
+        self.db.update_event_participants(10, 3, [222, 333, 444])
+        self.assertEqual(sorted(self.db.get_event_participants(10)), ["222", "333", "444"])
+        self.assertEqual(self.db.get_active_event()["participant_count"], 3)
+
+        self.db.update_event_participants(10, 0, [])
+        self.assertEqual(self.db.get_event_participants(10), [])
+
+    def test_single_participant_changes(self):
+        """Test adding and removing one participant keeps the count in step"""
+        self.db.store_event(11, "2024-01-01")
+
+        self.db.add_event_participant(11, 111)
+        self.db.add_event_participant(11, 222)
+        self.db.add_event_participant(11, 222)
+        self.assertEqual(self.db.get_active_event()["participant_count"], 2)
+
+        self.db.remove_event_participant(11, 111)
+        self.assertEqual(self.db.get_event_participants(11), ["222"])
+        self.assertEqual(self.db.get_active_event()["participant_count"], 1)
+
+    def test_legacy_participant_names_left_in_place(self):
+        """Test legacy comma-joined display names are kept and never copied into event_participants"""
+        self.db.store_event(12, "2024-01-01")
+        self.db._execute_with_retry("UPDATE events SET participant_names = 'alice,bob' WHERE event_id = 12")
+        self.db._execute_with_retry("PRAGMA user_version = 0")
+
+        self.db.close()
+        self.db = Database(self.db_path)
+
+        self.assertEqual(self.db.get_event_participants(12), [])
+        self.assertEqual(self.db.get_active_event()["participant_names"], "alice,bob")
+
+    def test_cleanup_old_data_in_chunks(self):
+        """Test old processed responses are removed across several chunks"""
+        old_ids = [f"old_{i}" for i in range(5)]
+        self.db.batch_mark_responses_processed(old_ids + ["recent"])
+        self.db._execute_with_retry("UPDATE processed_responses SET processed_at = datetime('now', '-40 days') WHERE response_id LIKE 'old_%'")
+
+        with patch("cogs.database.CLEANUP_CHUNK_SIZE", 2):
+            self.db.cleanup_old_data(days=30)
+
+        for response_id in old_ids:
+            self.assertFalse(self.db.is_response_processed(response_id))
+        self.assertTrue(self.db.is_response_processed("recent"))
+        # The WAL is checkpointed and truncated afterwards
+        self.assertEqual(os.path.getsize(f"{self.db_path}-wal"), 0)
+
+    def test_lookup_indexes(self):
+        """Test hot lookups are served by indexes rather than table scans"""
+        self.db.initialize_votes_table()
+        self.db.initialize_events_table()
+
+        queries = [
+            ("SELECT response_id, message_id, channel_id, status FROM applications WHERE message_id = ?", (1,)),
+            ("SELECT vote_type, COUNT(*) FROM votes WHERE response_id = ? GROUP BY vote_type", ("r",)),
+            ("SELECT * FROM events WHERE deleted = 0 ORDER BY created_at DESC LIMIT 1", ()),
+            ("SELECT rowid FROM processed_responses WHERE processed_at < ? LIMIT 10", ("2000-01-01 00:00:00",)),
+            ("SELECT response_id FROM processed_responses ORDER BY processed_at DESC LIMIT 10", ()),
+        ]
+        for query, params in queries:
+            with self.subTest(query=query):
+                plan = self.db._execute_with_retry(f"EXPLAIN QUERY PLAN {query}", params, fetch_all=True)
+                detail = " ".join(row[3] for row in plan)
+                self.assertIn("USING", detail)
+                self.assertNotIn("TEMP B-TREE", detail)
+
     def test_thread_safety(self):
         """Test database operations under concurrent access"""
         response_ids = [f"thread_test_{i}" for i in range(10)]
-        results = []
 
         def worker(response_id):
             try:
                 self.db.mark_response_processed(response_id)
-                results.append(self.db.is_response_processed(response_id))
+                return self.db.is_response_processed(response_id)
             except Exception:
-                results.append(False)
+                return False
 
-        threads = []
-        for response_id in response_ids:
-            thread = threading.Thread(target=worker, args=(response_id,))
-            threads.append(thread)
-            thread.start()
-
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(worker, response_ids))
 
         # All operations should have succeeded
         self.assertEqual(len(results), 10)
         self.assertTrue(all(results))
 
+    def test_concurrent_readers_and_writers(self):
+        """Test pooled readers and the shared writer work side by side without errors"""
+        self.db.record_votes([("busy_app", user_id, "approve") for user_id in range(5)])
+
+        def writer(offset):
+            for i in range(50):
+                self.db.mark_response_processed(f"busy_{offset}_{i}")
+                self.db.set_vote("busy_app", 100 + offset, "deny" if i % 2 else "approve")
+
+        def reader(_):
+            for _ in range(50):
+                self.db.get_vote_counts("busy_app")
+                self.db.get_votes("busy_app")
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(writer, offset) for offset in range(2)]
+            futures += [executor.submit(reader, n) for n in range(8)]
+            for future in futures:
+                future.result()  # Re-raises any error from the worker
+
+        self.assertTrue(all(self.db.is_response_processed(f"busy_{offset}_49") for offset in range(2)))
+        self.assertEqual(sum(self.db.get_vote_counts("busy_app").values()), 7)
+
     def test_application_stats(self):
         """Test application statistics calculation"""
         # Create test data
@@ -143,10 +508,11 @@ class TestDatabase(unittest.TestCase):
             ("app4", 777, 888, None),  # NULL status
         ]
 
-        for response_id, msg_id, chan_id, status in apps:
-            self.db.store_application_message(response_id, msg_id, chan_id)
-            if status and status != "pending":
-                self.db.set_application_status(response_id, status)
+        self.db.batch_store_applications((response_id, msg_id, chan_id) for response_id, msg_id, chan_id, _ in apps)
+        with self.db.transaction():
+            for response_id, _, _, status in apps:
+                if status and status != "pending":
+                    self.db.set_application_status(response_id, status)
 
         stats = self.db.get_application_stats()
 
@@ -155,6 +521,31 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(stats["denied"], 1)
         self.assertEqual(stats["pending"], 2)  # Including NULL status
 
+    def test_text_status_migration(self):
+        """Test a database with the old TEXT status column is migrated to integer codes"""
+        legacy_path = _temp_db_path()
+        self.addCleanup(os.unlink, legacy_path)
+
+        conn = sqlite3.connect(legacy_path)
+        conn.execute(
+            "CREATE TABLE applications (response_id TEXT PRIMARY KEY, message_id INTEGER, channel_id INTEGER, "
+            "status TEXT DEFAULT 'pending', created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.executemany(
+            "INSERT INTO applications (response_id, message_id, channel_id, status) VALUES (?, ?, 1, ?)",
+            [("a", 1, "accept"), ("b", 2, "denied"), ("c", 3, "pending"), ("d", 4, None)],
+        )
+        conn.commit()
+        conn.close()
+
+        db = Database(legacy_path)
+        self.addCleanup(db.close)  # Runs before the unlink, so SQLite removes its -wal/-shm files
+        self.assertEqual(db.get_application_status("a")["status"], "accepted")
+        self.assertEqual(db.get_application_status("b")["status"], "denied")
+        self.assertEqual(db.get_application_stats(), {"total": 4, "accepted": 1, "denied": 1, "pending": 2})
+        raw = db._execute_with_retry("SELECT status FROM applications WHERE response_id = ?", ("a",), fetch_one=True)
+        self.assertEqual(raw[0], ApplicationStatus.ACCEPTED)
+
     @patch("cogs.database.logger")
     def test_error_handling(self, mock_logger):
         """Test error handling in database operations with invalid database path"""
@@ -189,13 +580,14 @@ class TestDatabase(unittest.TestCase):
     def test_database_retry_mechanism(self):
         """Test database retry mechanism with operational errors"""
         # Test the retry mechanism by mocking operational errors
-        with patch.object(self.db, "_get_connection") as mock_get_conn:
+        self.db.close()  # Start without pooled connections so the next query opens one
+        with patch.object(self.db, "_get_connection") as mock_get_conn, patch("cogs.database.time.sleep") as mock_sleep:
             # Set up a mock connection that raises OperationalError first time,
             # then succeeds
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
-            mock_cursor.fetchone.return_value = None
-            mock_conn.cursor.return_value = mock_cursor
+            mock_cursor.fetchone.return_value = (0,)
+            mock_conn.execute.return_value = mock_cursor
 
             # First call raises error, second succeeds
             mock_get_conn.side_effect = [sqlite3.OperationalError("Database is locked"), mock_conn]
@@ -206,6 +598,7 @@ class TestDatabase(unittest.TestCase):
 
             # Verify retry was attempted
             self.assertEqual(mock_get_conn.call_count, 2)
+            mock_sleep.assert_called_once_with(0.1)  # First backoff step, without actually waiting
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+import discord
 from cogs.event_handler import EventHandler
 
+EASTERN = ZoneInfo("US/Eastern")
+
 
 class TestEventHandler(unittest.TestCase):
     def setUp(self):
@@ -27,8 +31,7 @@ class TestEventHandler(unittest.TestCase):
         with (
             patch.dict("os.environ", env_vars),
             patch("cogs.event_handler.Database") as mock_db,
-            patch("cogs.event_handler.tasks"),
-        ):  # Prevent task creation
+        ):
 
             self.mock_db = mock_db.return_value
 
@@ -36,8 +39,6 @@ class TestEventHandler(unittest.TestCase):
             self.handler = EventHandler.__new__(EventHandler)
             self.handler.bot = self.mock_bot
             self.handler.db = self.mock_db
-            self.handler._last_create_check = None
-            self.handler._last_delete_check = None
 
             # Load config manually
             self.handler._load_config()
@@ -50,7 +51,7 @@ class TestEventHandler(unittest.TestCase):
         self.assertEqual(self.handler.event_time_hour, 17)
         self.assertEqual(self.handler.create_day, 0)  # Monday
         self.assertEqual(self.handler.delete_day, 6)  # Sunday
-        self.assertEqual(self.handler.timezone.zone, "US/Eastern")
+        self.assertEqual(self.handler.timezone.key, "US/Eastern")
 
     def test_config_validation(self):
         """Test configuration validation"""
@@ -66,18 +67,77 @@ class TestEventHandler(unittest.TestCase):
         self.assertEqual(self.handler._day_name(6), "Sunday")
         self.assertEqual(self.handler._day_name(7), "Unknown")
 
-    def test_should_create_event(self):
-        """Test event creation timing logic"""
-        # Mock current time as Monday 8 PM
-        monday_8pm = datetime(2024, 1, 1, 20, 0, 0)  # Monday
-        monday_8pm = pytz.timezone("US/Eastern").localize(monday_8pm)
-
-        # Should create event on Monday at 8 PM
-        result = self.handler._should_create_event(monday_8pm, "2024-01-01-20")
-        self.assertTrue(result)
-
-        # Should not create on Tuesday
-        tuesday_8pm = datetime(2024, 1, 2, 20, 0, 0)  # Tuesday
-        tuesday_8pm = pytz.timezone("US/Eastern").localize(tuesday_8pm)
-        result = self.handler._should_create_event(tuesday_8pm, "2024-01-02-20")
-        self.assertFalse(result)
+    def test_next_occurrence(self):
+        """Test the schedule finds the next create window"""
+
+        # Sunday: the next Monday 8 PM window
+        sunday = datetime(2023, 12, 31, 12, 0, 0, tzinfo=EASTERN)
+        expected = datetime(2024, 1, 1, 20, 0, 0, tzinfo=EASTERN)
+        self.assertEqual(self.handler._next_occurrence(sunday, 0, 20), expected)
+
+        # Inside the window: its start, so it runs straight away
+        monday_830pm = datetime(2024, 1, 1, 20, 30, 0, tzinfo=EASTERN)
+        self.assertEqual(self.handler._next_occurrence(monday_830pm, 0, 20), expected)
+
+        # Once the window has passed: the following week
+        monday_9pm = datetime(2024, 1, 1, 21, 0, 0, tzinfo=EASTERN)
+        self.assertEqual(self.handler._next_occurrence(monday_9pm, 0, 20), datetime(2024, 1, 8, 20, 0, 0, tzinfo=EASTERN))
+
+    def test_calculate_next_sunday(self):
+        """Test the event date is the coming Sunday at the configured time"""
+        sunday_5pm = datetime(2024, 1, 7, 17, 0, 0, tzinfo=EASTERN)
+
+        monday = datetime(2024, 1, 1, 20, 0, 0, tzinfo=EASTERN)
+        self.assertEqual(self.handler._calculate_next_sunday(monday), sunday_5pm)
+
+        # Sunday before the event still uses that day; after it, the next week
+        self.assertEqual(self.handler._calculate_next_sunday(datetime(2024, 1, 7, 9, 0, 0, tzinfo=EASTERN)), sunday_5pm)
+        self.assertEqual(
+            self.handler._calculate_next_sunday(datetime(2024, 1, 7, 18, 0, 0, tzinfo=EASTERN)), datetime(2024, 1, 14, 17, 0, 0, tzinfo=EASTERN)
+        )
+
+    def test_delete_old_event_records_participants_first(self):
+        """Test participants are stored before the Discord delete and the event is marked deleted only after it"""
+        guild = MagicMock()
+        self.mock_bot.get_guild.return_value = guild
+        self.mock_db.get_active_event.return_value = {"event_id": 9}
+
+        async def users(limit=None):
+            for user_id in (111, 222):
+                yield MagicMock(id=user_id)
+
+        event = MagicMock()
+        event.users = users
+        event.delete = AsyncMock(side_effect=discord.HTTPException(MagicMock(status=500), "Server error"))
+        guild.get_scheduled_event.return_value = event
+
+        asyncio.run(self.handler._delete_old_event())
+
+        # The failed delete keeps the event active, but its participants are already recorded
+        self.mock_db.update_event_participants.assert_called_once_with(9, 2, [111, 222])
+        self.mock_db.mark_event_deleted.assert_not_called()
+
+        event.delete = AsyncMock()
+        asyncio.run(self.handler._delete_old_event())
+        self.mock_db.mark_event_deleted.assert_called_once_with(9)
+
+    def test_cleanup_stale_events(self):
+        """Test events missing on Discord are marked deleted and others are left alone"""
+        guild = MagicMock()
+        self.mock_bot.get_guild.return_value = guild
+        self.mock_db.get_all_active_events.return_value = [{"event_id": 1}, {"event_id": 2}, {"event_id": 3}, {"event_id": 4}]
+        # Event 4 is in the gateway cache, so it is not fetched
+        guild.get_scheduled_event.side_effect = lambda event_id: MagicMock() if event_id == 4 else None
+
+        async def fetch(event_id):
+            if event_id == 2:
+                raise discord.NotFound(MagicMock(status=404), "Unknown Guild Scheduled Event")
+            if event_id == 3:
+                raise discord.HTTPException(MagicMock(status=500), "Server error")
+            return MagicMock()
+
+        guild.fetch_scheduled_event = AsyncMock(side_effect=fetch)
+        asyncio.run(self.handler._cleanup_stale_events())
+
+        self.assertEqual(guild.fetch_scheduled_event.await_count, 3)
+        self.mock_db.mark_event_deleted.assert_called_once_with(2)
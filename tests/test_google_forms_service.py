@@ -1,14 +1,17 @@
+import asyncio
+import threading
 import unittest
-from unittest.mock import patch, Mock, mock_open
+from unittest.mock import patch, Mock, AsyncMock, mock_open
 from cogs.google_forms_service import GoogleFormsService
 
 
 class TestGoogleFormsService(unittest.TestCase):
 
+    @patch("builtins.open", new_callable=mock_open)
     @patch("cogs.google_forms_service.build")
     @patch("cogs.google_forms_service.Credentials.from_authorized_user_file")
     @patch("cogs.google_forms_service.os.path.exists")
-    def test_service_initialization_with_valid_token(self, mock_exists, mock_from_file, mock_build):
+    def test_service_initialization_with_valid_token(self, mock_exists, mock_from_file, mock_build, mock_open_file):
         """Test service initialization with valid existing token"""
         # Setup mocks
         mock_exists.return_value = True
@@ -24,15 +27,25 @@ class TestGoogleFormsService(unittest.TestCase):
         with patch.dict("os.environ", env_vars):
             service = GoogleFormsService()
 
+        # Nothing is set up until the service is first used
+        mock_build.assert_not_called()
+        try:
+            asyncio.run(service._ensure_service())
+        finally:
+            service.close()
+
         mock_build.assert_called_once()
         self.assertIsNotNone(service.service)
+        # A valid token is not rewritten
+        mock_open_file.assert_not_called()
 
     @patch("cogs.google_forms_service.build")
     @patch("cogs.google_forms_service.InstalledAppFlow.from_client_secrets_file")
     @patch("cogs.google_forms_service.os.path.exists")
     @patch("builtins.open", mock_open())
     @patch("cogs.google_forms_service.os.chmod")
-    def test_service_initialization_without_token(self, mock_chmod, mock_exists, mock_flow_class, mock_build):
+    @patch("cogs.google_forms_service.os.replace")
+    def test_service_initialization_without_token(self, mock_replace, mock_chmod, mock_exists, mock_flow_class, mock_build):
         """Test service initialization when no token exists"""
         # Setup mocks
         mock_exists.return_value = False
@@ -49,9 +62,14 @@ class TestGoogleFormsService(unittest.TestCase):
 
         with patch.dict("os.environ", env_vars):
             service = GoogleFormsService()
+        try:
+            asyncio.run(service._ensure_service())
+        finally:
+            service.close()
 
         mock_flow.run_local_server.assert_called_once()
         mock_build.assert_called_once()
+        mock_replace.assert_called_once_with("token.json.tmp", "token.json")
 
     def test_build_question_map(self):
         """Test building question map from form info"""
@@ -76,3 +94,65 @@ class TestGoogleFormsService(unittest.TestCase):
         self.assertEqual(len(question_map), 2)
         self.assertEqual(question_map["question1"], "What is your name?")
         self.assertEqual(question_map["question2"], "What is your email?")
+
+    @patch("cogs.google_forms_service.AuthorizedHttp")
+    @patch("cogs.google_forms_service.build")
+    @patch("cogs.google_forms_service.Credentials.from_authorized_user_file")
+    @patch("cogs.google_forms_service.os.path.exists", return_value=True)
+    def test_requests_run_on_own_executor(self, mock_exists, mock_from_file, mock_build, mock_authorized_http):
+        """Test API requests execute on the service's threads with a per-thread connection"""
+        mock_from_file.return_value = Mock(valid=True)
+        with patch.dict("os.environ", {"GOOGLE_CREDENTIALS_FILE": "credentials.json", "GOOGLE_TOKEN_FILE": "token.json"}):
+            service = GoogleFormsService()
+
+        threads = []
+
+        def execute(http):
+            threads.append(threading.current_thread().name)
+            return {"responses": [{"responseId": "r1"}]}
+
+        collection = mock_build.return_value.forms.return_value.responses.return_value
+        request = collection.list.return_value
+        request.execute.side_effect = execute
+        collection.list_next.return_value = None
+
+        try:
+            responses = asyncio.run(service.get_form_responses("form"))
+        finally:
+            service.close()
+
+        self.assertEqual(responses, [{"responseId": "r1"}])
+        request.execute.assert_called_once_with(http=mock_authorized_http.return_value)
+        self.assertTrue(threads[0].startswith("gforms"))
+
+    def test_form_responses_follow_pages(self):
+        """Test every page of responses is fetched with the partial-response field mask"""
+        service = GoogleFormsService.__new__(GoogleFormsService)
+        service.service = Mock()
+        collection = service._responses = Mock()
+        first_page, second_page = Mock(name="first_page"), Mock(name="second_page")
+        collection.list.return_value = first_page
+        collection.list_next.side_effect = [second_page, None]
+        results = {first_page: {"responses": [{"responseId": "r1"}], "nextPageToken": "t"}, second_page: {"responses": [{"responseId": "r2"}]}}
+
+        async def run(request):
+            return results[request]
+
+        with patch.object(GoogleFormsService, "_run", side_effect=run):
+            responses = asyncio.run(service.get_form_responses("form"))
+
+        self.assertEqual([r["responseId"] for r in responses], ["r1", "r2"])
+        self.assertEqual(collection.list.call_args.kwargs["fields"], "nextPageToken,responses(responseId,createTime,answers)")
+        self.assertNotIn("filter", collection.list.call_args.kwargs)
+
+    def test_form_responses_submitted_since(self):
+        """Test a submission-time filter is passed through to the API"""
+        service = GoogleFormsService.__new__(GoogleFormsService)
+        service.service = Mock()
+        collection = service._responses = Mock()
+        collection.list_next.return_value = None
+
+        with patch.object(GoogleFormsService, "_run", AsyncMock(return_value={})):
+            asyncio.run(service.get_form_responses("form", "2024-05-01T12:00:00Z"))
+
+        self.assertEqual(collection.list.call_args.kwargs["filter"], "timestamp >= 2024-05-01T12:00:00Z")
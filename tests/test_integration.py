@@ -1,6 +1,7 @@
 import unittest
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from cogs.database import Database
 
 
@@ -72,33 +73,18 @@ class TestIntegration(unittest.TestCase):
         self.db.store_application_message(response_id, message_id, channel_id)
 
         # Simulate concurrent voting
-        import threading
-
-        results = []
-
-        def vote_worker(user_id, vote_type):
+        def vote_worker(i):
+            user_id = 1000 + i
+            vote_type = "approve" if i % 2 == 0 else "deny"
             try:
                 self.db.add_vote(response_id, user_id, vote_type)
-                results.append(True)
+                return True
             except Exception as e:
                 print(f"Vote error: {e}")
-                results.append(False)
-
-        # Create multiple voting threads
-        threads = []
-        for i in range(5):
-            user_id = 1000 + i
-            vote_type = "approve" if i % 2 == 0 else "deny"
-            thread = threading.Thread(target=vote_worker, args=(user_id, vote_type))
-            threads.append(thread)
-
-        # Start all threads
-        for thread in threads:
-            thread.start()
+                return False
 
-        # Wait for completion
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(vote_worker, range(5)))
 
         # Verify all votes were recorded
         self.assertEqual(len(results), 5)
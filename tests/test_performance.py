@@ -1,36 +1,49 @@
 import unittest
+import multiprocessing
+import os
+import tempfile
 import time
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from cogs.database import Database
-import tempfile
-import os
+
+
+def _process_writer(args):
+    """Write a block of processed marks from a separate process through its own Database"""
+    db_path, worker_id, count = args
+    db = Database(db_path)
+    try:
+        for i in range(count):
+            db.mark_response_processed(f"proc_{worker_id}_{i}")
+    finally:
+        db.close()
+    return count
 
 
 class TestPerformance(unittest.TestCase):
     """Performance and load testing"""
 
     def setUp(self):
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db = Database(self.temp_db.name)
+        # Nothing here checks durability, so keep page writes off the disk
+        self.db = Database(":memory:")
         self.db.initialize_votes_table()
 
     def tearDown(self):
         self.db.close()
-        os.unlink(self.temp_db.name)
 
     def test_bulk_operations_performance(self):
         """Test performance with bulk database operations"""
-        start_time = time.time()
+        response_ids = [f"perf_test_{i}" for i in range(1000)]
+        start_time = time.perf_counter_ns()
 
-        # Perform 1000 operations
-        for i in range(1000):
-            response_id = f"perf_test_{i}"
-            self.db.mark_response_processed(response_id)
-            self.db.store_application_message(response_id, i, i)
+        # Perform 1000 operations inside one transaction, so the loop pays for a single commit
+        with self.db.transaction():
+            for i, response_id in enumerate(response_ids):
+                self.db.mark_response_processed(response_id)
+                self.db.store_application_message(response_id, i, i)
 
-        end_time = time.time()
-        duration = end_time - start_time
+        end_time = time.perf_counter_ns()
+        duration = (end_time - start_time) / 1e9
 
         # Should complete within reasonable time (adjust threshold as needed)
         self.assertLess(
@@ -40,39 +53,62 @@ class TestPerformance(unittest.TestCase):
                 duration:.2f}s",
         )
 
+    def test_batch_operations_performance(self):
+        """Test the batched write helpers handle the same 1000 rows in one call each"""
+        response_ids = [f"batch_test_{i}" for i in range(1000)]
+
+        start_time = time.perf_counter_ns()
+        self.db.batch_mark_responses_processed(response_ids)
+        self.db.batch_store_applications((response_id, i, i) for i, response_id in enumerate(response_ids))
+        duration = (time.perf_counter_ns() - start_time) / 1e9
+
+        self.assertTrue(self.db.is_response_processed("batch_test_999"))
+        self.assertEqual(self.db.get_application_status("batch_test_999")["message_id"], 999)
+        self.assertLess(duration, 1.0, f"Batched operations took {duration:.2f}s")
+
+    def test_multiprocess_writes(self):
+        """Test separate processes can write to one WAL database file without lock errors"""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.addCleanup(os.unlink, db_path)
+        Database(db_path).close()  # Create the schema before the workers race to open it
+
+        num_procs, writes_per_proc = 4, 100
+        with multiprocessing.get_context("spawn").Pool(num_procs) as pool:
+            written = pool.map(_process_writer, [(db_path, n, writes_per_proc) for n in range(num_procs)])
+
+        self.assertEqual(sum(written), num_procs * writes_per_proc)
+        db = Database(db_path)
+        self.addCleanup(db.close)
+        # mark_response_processed logs failures rather than raising, so count what actually landed
+        stored = db._execute_with_retry("SELECT COUNT(*) FROM processed_responses WHERE response_id LIKE 'proc_%'", fetch_one=True)[0]
+        self.assertEqual(stored, num_procs * writes_per_proc)
+
     def test_concurrent_database_access(self):
         """Test database performance under concurrent access"""
         num_threads = 10
         operations_per_thread = 100
-        results = []
 
         def worker(thread_id):
             thread_results = []
             for i in range(operations_per_thread):
                 try:
                     response_id = f"thread_{thread_id}_op_{i}"
-                    start = time.time()
+                    start = time.perf_counter_ns()
                     self.db.mark_response_processed(response_id)
-                    end = time.time()
+                    end = time.perf_counter_ns()
                     thread_results.append(end - start)
                 except Exception as e:
                     thread_results.append(-1)  # Error marker
-            results.extend(thread_results)
-
-        # Start all threads
-        threads = []
-        start_time = time.time()
+            return thread_results
 
-        for i in range(num_threads):
-            thread = threading.Thread(target=worker, args=(i,))
-            threads.append(thread)
-            thread.start()
+        start_time = time.perf_counter_ns()
 
-        # Wait for completion
-        for thread in threads:
-            thread.join()
+        # Each worker returns its own timings, gathered once all have finished
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = list(chain.from_iterable(executor.map(worker, range(num_threads))))
 
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
 
         # Verify no errors occurred
         error_count = sum(1 for r in results if r < 0)
@@ -80,7 +116,7 @@ class TestPerformance(unittest.TestCase):
 
         # Check average operation time
         valid_times = [r for r in results if r >= 0]
-        avg_time = sum(valid_times) / len(valid_times)
+        avg_time = sum(valid_times) / len(valid_times) / 1e9  # Timings are integer nanoseconds
 
         # Each operation should complete quickly
         self.assertLess(
@@ -91,5 +127,5 @@ class TestPerformance(unittest.TestCase):
         )
 
         print(f"Concurrent test: {num_threads} threads, {operations_per_thread} ops each")
-        print(f"Total time: {end_time - start_time:.2f}s")
-        print(f"Average operation time: {avg_time:.3f}s")
+        print(f"Total time: {(end_time - start_time) / 1e9:.2f}s")
+        print(f"Average operation time: {avg_time * 1e6:.1f}us")